@@ -1,8 +1,28 @@
 # -*- coding: utf-8 -*-
-"""
+r"""
 ASCII Table Sublime Plugin.
 
-Display an extended ASCII table in Sublime for reference.  Allows searching the table for specific info.
+Display an extended ASCII table in Sublime for reference.  Allows searching the table for specific info:
+the search panel shows whole rows, so any column (decimal, hex, octal, character, HTML entity or description) can be
+searched at once.
+
+"Show Code Page" switches the table to any single byte code page Python's `codecs` knows (cp437, latin-1, koi8-r,
+etc.), or back to the extended ASCII table when left empty; bytes the code page doesn't define are left out.
+
+The Unicode table shows one page of 256 code points at a time; within it, `]` and `[` move to the next and
+previous page with characters, and "Search" searches the page in view.
+"Search Unicode" searches code points, HTML entity names, and character names across all of Unicode;
+its index is built in the background the first time and cached in Sublime's cache folder.
+
+"Hexdump File" shows a file one byte per row, with the same columns as the ASCII table plus the byte's offset.
+The file is memory mapped and shown 4096 bytes at a time, so even very large files open right away; `]` and `[`
+move between pages, and "Go to Offset" jumps straight to a byte.
+
+"Decode Escapes" replaces every `\xNN` (a byte of the ASCII table), `&#NNN;`, `&#xXXXX;`, `&name;` and `U+XXXX`
+escape in the selections (or the whole file) with its character; "Annotate Escapes" leaves the escapes and adds
+the character and its description after each one.  Escapes that don't name a character are left alone.
+
+Set `show_character_info` in `ascii_table.sublime-settings` to show the character under the cursor in the status bar.
 
 Just define the commands below:
 
@@ -15,29 +35,64 @@ Just define the commands below:
         "command": "ascii_table"
     },
     {
-        "caption": "ASCII Table: Search Decimal",
-        "command": "ascii_table_search",
-        "args": {"info_type": "dec"}
+        "caption": "ASCII Table: Show Code Page",
+        "command": "ascii_table_code_page"
+    },
+    {
+        "caption": "ASCII Table: Search",
+        "command": "ascii_table_search"
     },
     {
-        "caption": "ASCII Table: Search Hexidecimal",
-        "command": "ascii_table_search",
-        "args": {"info_type": "hex"}
+        "caption": "ASCII Table: Show Unicode",
+        "command": "ascii_table",
+        "args": {"table": "unicode"}
     },
     {
-        "caption": "ASCII Table: Search Octal",
-        "command": "ascii_table_search",
-        "args": {"info_type": "oct"}
+        "caption": "ASCII Table: Go to Unicode Character",
+        "command": "ascii_table_page",
+        "args": {"page": "goto", "table": "unicode"}
     },
     {
-        "caption": "ASCII Table: Search Character",
-        "command": "ascii_table_search",
-        "args": {"info_type": "chr"}
+        "caption": "ASCII Table: Search Unicode",
+        "command": "ascii_table_unicode_search"
     },
     {
-        "caption": "ASCII Table: Search Info",
-        "command": "ascii_table_search",
-        "args": {"info_type": "inf"}
+        "caption": "ASCII Table: Hexdump File",
+        "command": "ascii_table_hexdump"
+    },
+    {
+        "caption": "ASCII Table: Go to Offset",
+        "command": "ascii_table_page",
+        "args": {"page": "goto", "table": "hexdump"}
+    },
+    {
+        "caption": "ASCII Table: Decode Escapes",
+        "command": "ascii_table_escapes"
+    },
+    {
+        "caption": "ASCII Table: Annotate Escapes",
+        "command": "ascii_table_escapes",
+        "args": {"annotate": true}
+    },
+    {
+        "caption": "ASCII Table: Next Unicode Page",
+        "command": "ascii_table_page",
+        "args": {"page": "next", "table": "unicode"}
+    },
+    {
+        "caption": "ASCII Table: Previous Unicode Page",
+        "command": "ascii_table_page",
+        "args": {"page": "previous", "table": "unicode"}
+    },
+    {
+        "caption": "ASCII Table: Next Hexdump Page",
+        "command": "ascii_table_page",
+        "args": {"page": "next", "table": "hexdump"}
+    },
+    {
+        "caption": "ASCII Table: Previous Hexdump Page",
+        "command": "ascii_table_page",
+        "args": {"page": "previous", "table": "hexdump"}
     },
 ```
 
@@ -58,7 +113,21 @@ THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABI
 CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
+import sublime
 import sublime_plugin
+import base64
+import bisect
+import codecs
+import functools
+import json
+import mmap
+import os
+import re
+import sys
+import threading
+import unicodedata
+from array import array
+from html.entities import codepoint2name, name2codepoint
 
 DEC = 0
 HEX = 1
@@ -69,320 +138,956 @@ INF = 5
 
 
 ASCII_INFO = {
-    0: {"char": "NUL", "info": "Null"},
-    1: {"char": "SOH", "info": "Start of heading"},
-    2: {"char": "STX", "info": "Start of text"},
-    3: {"char": "ETX", "info": "End of text"},
-    4: {"char": "EOT", "info": "End of transmission"},
-    5: {"char": "ENQ", "info": "Enquiry"},
-    6: {"char": "ACK", "info": "Acknowledge"},
-    7: {"char": "BEL", "info": "Bell"},
-    8: {"char": "BS", "info": "Backspace"},
-    9: {"char": "TAB", "info": "Horizontal tab"},
-    10: {"char": "LF", "info": "Line feed"},
-    11: {"char": "VT", "info": "Vertical tab"},
-    12: {"char": "FF", "info": "Form feed"},
-    13: {"char": "CR", "info": "Carriage return"},
-    14: {"char": "SO", "info": "Shift out"},
-    15: {"char": "SI", "info": "Shift in"},
-    16: {"char": "DLE", "info": "Data link escape"},
-    17: {"char": "DC1", "info": "Device control 1"},
-    18: {"char": "DC2", "info": "Device control 2"},
-    19: {"char": "DC3", "info": "Device control 3"},
-    20: {"char": "DC4", "info": "Device control 4"},
-    21: {"char": "NAK", "info": "Negative acknowledge"},
-    22: {"char": "SYN", "info": "Synchronous idle"},
-    23: {"char": "ETB", "info": "End of transmission block"},
-    24: {"char": "CAN", "info": "Cancel"},
-    25: {"char": "EM", "info": "End of medium"},
-    26: {"char": "SUB", "info": "Substitute"},
-    27: {"char": "ESC", "info": "Escape"},
-    28: {"char": "FS", "info": "File separator"},
-    29: {"char": "GS", "info": "Group separator"},
-    30: {"char": "RS", "info": "Record separator"},
-    31: {"char": "US", "info": "Unit separator"},
-    32: {"char": "SPACE", "info": "Space"},
-    33: {"info": "Exclamation mark"},
-    34: {"html_name": "quot", "info": "Double quotes (or speech marks)"},
-    35: {"info": "Number"},
-    36: {"info": "Dollar"},
-    37: {"info": "Procenttecken"},
-    38: {"html_name": "amp", "info": "Ampersand"},
-    39: {"info": "Single quote"},
-    40: {"info": "Open parenthesis (or open bracket)"},
-    41: {"info": "Close parenthesis (or close bracket)"},
-    42: {"info": "Asterisk"},
-    43: {"info": "Plus"},
-    44: {"info": "Comma"},
-    45: {"info": "Hyphen"},
-    46: {"info": "Period, dot or full stop"},
-    47: {"info": "Slash or divide"},
-    48: {"info": "Zero"},
-    49: {"info": "One"},
-    50: {"info": "Two"},
-    51: {"info": "Three"},
-    52: {"info": "Four"},
-    53: {"info": "Five"},
-    54: {"info": "Six"},
-    55: {"info": "Seven"},
-    56: {"info": "Eight"},
-    57: {"info": "Nine"},
-    58: {"info": "Colon"},
-    59: {"info": "Semicolon"},
-    60: {"html_name": "lt", "info": "Less than (or open angled bracket)"},
-    61: {"info": "Equals"},
-    62: {"html_name": "gt", "info": "Greater than (or close angled bracket)"},
-    63: {"info": "Question mark"},
-    64: {"info": "At symbol"},
-    65: {"info": "Uppercase A"},
-    66: {"info": "Uppercase B"},
-    67: {"info": "Uppercase C"},
-    68: {"info": "Uppercase D"},
-    69: {"info": "Uppercase E"},
-    70: {"info": "Uppercase F"},
-    71: {"info": "Uppercase G"},
-    72: {"info": "Uppercase H"},
-    73: {"info": "Uppercase I"},
-    74: {"info": "Uppercase J"},
-    75: {"info": "Uppercase K"},
-    76: {"info": "Uppercase L"},
-    77: {"info": "Uppercase M"},
-    78: {"info": "Uppercase N"},
-    79: {"info": "Uppercase O"},
-    80: {"info": "Uppercase P"},
-    81: {"info": "Uppercase Q"},
-    82: {"info": "Uppercase R"},
-    83: {"info": "Uppercase S"},
-    84: {"info": "Uppercase T"},
-    85: {"info": "Uppercase U"},
-    86: {"info": "Uppercase V"},
-    87: {"info": "Uppercase W"},
-    88: {"info": "Uppercase X"},
-    89: {"info": "Uppercase Y"},
-    90: {"info": "Uppercase Z"},
-    91: {"info": "Opening bracket"},
-    92: {"info": "Backslash"},
-    93: {"info": "Closing bracket"},
-    94: {"info": "Caret - circumflex"},
-    95: {"info": "Underscore"},
-    96: {"info": "Grave accent"},
-    97: {"info": "Lowercase a"},
-    98: {"info": "Lowercase b"},
-    99: {"info": "Lowercase c"},
-    100: {"info": "Lowercase d"},
-    101: {"info": "Lowercase e"},
-    102: {"info": "Lowercase f"},
-    103: {"info": "Lowercase g"},
-    104: {"info": "Lowercase h"},
-    105: {"info": "Lowercase i"},
-    106: {"info": "Lowercase j"},
-    107: {"info": "Lowercase k"},
-    108: {"info": "Lowercase l"},
-    109: {"info": "Lowercase m"},
-    110: {"info": "Lowercase n"},
-    111: {"info": "Lowercase o"},
-    112: {"info": "Lowercase p"},
-    113: {"info": "Lowercase q"},
-    114: {"info": "Lowercase r"},
-    115: {"info": "Lowercase s"},
-    116: {"info": "Lowercase t"},
-    117: {"info": "Lowercase u"},
-    118: {"info": "Lowercase v"},
-    119: {"info": "Lowercase w"},
-    120: {"info": "Lowercase x"},
-    121: {"info": "Lowercase y"},
-    122: {"info": "Lowercase z"},
-    123: {"info": "Opening brace"},
-    124: {"info": "Vertical bar"},
-    125: {"info": "Closing brace"},
-    126: {"info": "Equivalency sign - tilde"},
-    127: {"char": "DEL", "info": "Delete"},
-    128: {"char": "€", "html_name": "euro", "info": "Euro sign"},
-    # 129: {"char": " ", "info": " "},
-    130: {"char": "‚", "html_name": "sbquo", "info": "Single low-9 quotation mark"},
-    131: {"char": "ƒ", "html_name": "fnof", "info": "Latin small letter f with hook"},
-    132: {"char": "„", "html_name": "bdquo", "info": "Double low-9 quotation mark"},
-    133: {"char": "…", "html_name": "hellip", "info": "Horizontal ellipsis"},
-    134: {"char": "†", "html_name": "dagger", "info": "Dagger"},
-    135: {"char": "‡", "html_name": "Dagger", "info": "Double dagger"},
-    136: {"char": "ˆ", "html_name": "circ", "info": "Modifier letter circumflex accent"},
-    137: {"char": "‰", "html_name": "permil", "info": "Per mille sign"},
-    138: {"char": "Š", "html_name": "Scaron", "info": "Latin capital letter S with caron"},
-    139: {"char": "‹", "html_name": "lsaquo", "info": "Single left-pointing angle quotation"},
-    140: {"char": "Œ", "html_name": "OElig", "info": "Latin capital ligature OE"},
-    # 141: {"char": " ", "info": " "},
-    142: {"char": "Ž", "info": "Latin captial letter Z with caron"},
-    # 143: {"char": " ", "info": " "},
-    # 144: {"char": " ", "info": " "},
-    145: {"char": "‘", "html_name": "lsquo", "info": "Left single quotation mark"},
-    146: {"char": "’", "html_name": "rsquo", "info": "Right single quotation mark"},
-    147: {"char": "“", "html_name": "ldquo", "info": "Left double quotation mark"},
-    148: {"char": "”", "html_name": "rdquo", "info": "Right double quotation mark"},
-    149: {"char": "•", "html_name": "bull", "info": "Bullet"},
-    150: {"char": "–", "html_name": "ndash", "info": "En dash"},
-    151: {"char": "—", "html_name": "mdash", "info": "Em dash"},
-    152: {"char": "˜", "html_name": "tilde", "info": "Small tilde"},
-    153: {"char": "™", "html_name": "trade", "info": "Trade mark sign"},
-    154: {"char": "š", "html_name": "scaron", "info": "Latin small letter S with caron"},
-    155: {"char": "›", "html_name": "rsaquo", "info": "Single right-pointing angle quotation mark"},
-    156: {"char": "œ", "html_name": "oelig", "info": "Latin small ligature oe"},
-    # 157: {"char": " ", "info": " "},
-    158: {"char": "ž", "info": "Latin small letter z with caron"},
-    159: {"char": "Ÿ", "html_name": "yuml", "info": "Latin capital letter Y with diaeresis"},
-    160: {"char": " ", "html_name": "nbsp", "info": "Non-breaking space"},
-    161: {"char": "¡", "html_name": "iexcl", "info": "Inverted exclamation mark"},
-    162: {"char": "¢", "html_name": "cent", "info": "Cent sign"},
-    163: {"char": "£", "html_name": "pound", "info": "Pound sign"},
-    164: {"char": "¤", "html_name": "curren", "info": "Currency sign"},
-    165: {"char": "¥", "html_name": "yen", "info": "Yen sign"},
-    166: {"char": "¦", "html_name": "brvbar", "info": "Pipe, Broken vertical bar"},
-    167: {"char": "§", "html_name": "sect", "info": "Section sign"},
-    168: {"char": "¨", "html_name": "uml", "info": "Spacing diaeresis - umlaut"},
-    169: {"char": "©", "html_name": "copy", "info": "Copyright sign"},
-    170: {"char": "ª", "html_name": "ordf", "info": "Feminine ordinal indicator"},
-    171: {"char": "«", "html_name": "laquo", "info": "Left double angle quotes"},
-    172: {"char": "¬", "html_name": "not", "info": "Not sign"},
-    173: {"char": "\xad", "html_name": "shy", "info": "Soft hyphen"},
-    174: {"char": "®", "html_name": "reg", "info": "Registered trade mark sign"},
-    175: {"char": "¯", "html_name": "macr", "info": "Spacing macron - overline"},
-    176: {"char": "°", "html_name": "deg", "info": "Degree sign"},
-    177: {"char": "±", "html_name": "plusmn", "info": "Plus-or-minus sign"},
-    178: {"char": "²", "html_name": "sup2", "info": "Superscript two - squared"},
-    179: {"char": "³", "html_name": "sup3", "info": "Superscript three - cubed"},
-    180: {"char": "´", "html_name": "acute", "info": "Acute accent - spacing acute"},
-    181: {"char": "µ", "html_name": "micro", "info": "Micro sign"},
-    182: {"char": "¶", "html_name": "para", "info": "Pilcrow sign - paragraph sign"},
-    183: {"char": "·", "html_name": "middot", "info": "Middle dot - Georgian comma"},
-    184: {"char": "¸", "html_name": "cedil", "info": "Spacing cedilla"},
-    185: {"char": "¹", "html_name": "sup1", "info": "Superscript one"},
-    186: {"char": "º", "html_name": "ordm", "info": "Masculine ordinal indicator"},
-    187: {"char": "»", "html_name": "raquo", "info": "Right double angle quotes"},
-    188: {"char": "¼", "html_name": "frac14", "info": "Fraction one quarter"},
-    189: {"char": "½", "html_name": "frac12", "info": "Fraction one half"},
-    190: {"char": "¾", "html_name": "frac34", "info": "Fraction three quarters"},
-    191: {"char": "¿", "html_name": "iquest", "info": "Inverted question mark"},
-    192: {"char": "À", "html_name": "Agrave", "info": "Latin capital letter A with grave"},
-    193: {"char": "Á", "html_name": "Aacute", "info": "Latin capital letter A with acute"},
-    194: {"char": "Â", "html_name": "Acirc", "info": "Latin capital letter A with circumflex"},
-    195: {"char": "Ã", "html_name": "Atilde", "info": "Latin capital letter A with tilde"},
-    196: {"char": "Ä", "html_name": "Auml", "info": "Latin capital letter A with diaeresis"},
-    197: {"char": "Å", "html_name": "Aring", "info": "Latin capital letter A with ring above"},
-    198: {"char": "Æ", "html_name": "AElig", "info": "Latin capital letter AE"},
-    199: {"char": "Ç", "html_name": "Ccedil", "info": "Latin capital letter C with cedilla"},
-    200: {"char": "È", "html_name": "Egrave", "info": "Latin capital letter E with grave"},
-    201: {"char": "É", "html_name": "Eacute", "info": "Latin capital letter E with acute"},
-    202: {"char": "Ê", "html_name": "Ecirc", "info": "Latin capital letter E with circumflex"},
-    203: {"char": "Ë", "html_name": "Euml", "info": "Latin capital letter E with diaeresis"},
-    204: {"char": "Ì", "html_name": "Igrave", "info": "Latin capital letter I with grave"},
-    205: {"char": "Í", "html_name": "Iacute", "info": "Latin capital letter I with acute"},
-    206: {"char": "Î", "html_name": "Icirc", "info": "Latin capital letter I with circumflex"},
-    207: {"char": "Ï", "html_name": "Iuml", "info": "Latin capital letter I with diaeresis"},
-    208: {"char": "Ð", "html_name": "ETH", "info": "Latin capital letter ETH"},
-    209: {"char": "Ñ", "html_name": "Ntilde", "info": "Latin capital letter N with tilde"},
-    210: {"char": "Ò", "html_name": "Ograve", "info": "Latin capital letter O with grave"},
-    211: {"char": "Ó", "html_name": "Oacute", "info": "Latin capital letter O with acute"},
-    212: {"char": "Ô", "html_name": "Ocirc", "info": "Latin capital letter O with circumflex"},
-    213: {"char": "Õ", "html_name": "Otilde", "info": "Latin capital letter O with tilde"},
-    214: {"char": "Ö", "html_name": "Ouml", "info": "Latin capital letter O with diaeresis"},
-    215: {"char": "×", "html_name": "times", "info": "Multiplication sign"},
-    216: {"char": "Ø", "html_name": "Oslash", "info": "Latin capital letter O with slash"},
-    217: {"char": "Ù", "html_name": "Ugrave", "info": "Latin capital letter U with grave"},
-    218: {"char": "Ú", "html_name": "Uacute", "info": "Latin capital letter U with acute"},
-    219: {"char": "Û", "html_name": "Ucirc", "info": "Latin capital letter U with circumflex"},
-    220: {"char": "Ü", "html_name": "Uuml", "info": "Latin capital letter U with diaeresis"},
-    221: {"char": "Ý", "html_name": "Yacute", "info": "Latin capital letter Y with acute"},
-    222: {"char": "Þ", "html_name": "THORN", "info": "Latin capital letter THORN"},
-    223: {"char": "ß", "html_name": "szlig", "info": "Latin small letter sharp s - ess-zed"},
-    224: {"char": "à", "html_name": "agrave", "info": "Latin small letter a with grave"},
-    225: {"char": "á", "html_name": "aacute", "info": "Latin small letter a with acute"},
-    226: {"char": "â", "html_name": "acirc", "info": "Latin small letter a with circumflex"},
-    227: {"char": "ã", "html_name": "atilde", "info": "Latin small letter a with tilde"},
-    228: {"char": "ä", "html_name": "auml", "info": "Latin small letter a with diaeresis"},
-    229: {"char": "å", "html_name": "aring", "info": "Latin small letter a with ring above"},
-    230: {"char": "æ", "html_name": "aelig", "info": "Latin small letter ae"},
-    231: {"char": "ç", "html_name": "ccedil", "info": "Latin small letter c with cedilla"},
-    232: {"char": "è", "html_name": "egrave", "info": "Latin small letter e with grave"},
-    233: {"char": "é", "html_name": "eacute", "info": "Latin small letter e with acute"},
-    234: {"char": "ê", "html_name": "ecirc", "info": "Latin small letter e with circumflex"},
-    235: {"char": "ë", "html_name": "euml", "info": "Latin small letter e with diaeresis"},
-    236: {"char": "ì", "html_name": "igrave", "info": "Latin small letter i with grave"},
-    237: {"char": "í", "html_name": "iacute", "info": "Latin small letter i with acute"},
-    238: {"char": "î", "html_name": "icirc", "info": "Latin small letter i with circumflex"},
-    239: {"char": "ï", "html_name": "iuml", "info": "Latin small letter i with diaeresis"},
-    240: {"char": "ð", "html_name": "eth", "info": "Latin small letter eth"},
-    241: {"char": "ñ", "html_name": "ntilde", "info": "Latin small letter n with tilde"},
-    242: {"char": "ò", "html_name": "ograve", "info": "Latin small letter o with grave"},
-    243: {"char": "ó", "html_name": "oacute", "info": "Latin small letter o with acute"},
-    244: {"char": "ô", "html_name": "ocirc", "info": "Latin small letter o with circumflex"},
-    245: {"char": "õ", "html_name": "otilde", "info": "Latin small letter o with tilde"},
-    246: {"char": "ö", "html_name": "ouml", "info": "Latin small letter o with diaeresis"},
-    247: {"char": "÷", "html_name": "divide", "info": "Division sign"},
-    248: {"char": "ø", "html_name": "oslash", "info": "Latin small letter o with slash"},
-    249: {"char": "ù", "html_name": "ugrave", "info": "Latin small letter u with grave"},
-    250: {"char": "ú", "html_name": "uacute", "info": "Latin small letter u with acute"},
-    251: {"char": "û", "html_name": "ucirc", "info": "Latin small letter u with circumflex"},
-    252: {"char": "ü", "html_name": "uuml", "info": "Latin small letter u with diaeresis"},
-    253: {"char": "ý", "html_name": "yacute", "info": "Latin small letter y with acute"},
-    254: {"char": "þ", "html_name": "thorn", "info": "Latin small letter thorn"},
-    255: {"char": "ÿ", "html_name": "yuml", "info": "Latin small letter y with diaeresis"},
+    0: ("NUL", None, "Null"),
+    1: ("SOH", None, "Start of heading"),
+    2: ("STX", None, "Start of text"),
+    3: ("ETX", None, "End of text"),
+    4: ("EOT", None, "End of transmission"),
+    5: ("ENQ", None, "Enquiry"),
+    6: ("ACK", None, "Acknowledge"),
+    7: ("BEL", None, "Bell"),
+    8: ("BS", None, "Backspace"),
+    9: ("TAB", None, "Horizontal tab"),
+    10: ("LF", None, "Line feed"),
+    11: ("VT", None, "Vertical tab"),
+    12: ("FF", None, "Form feed"),
+    13: ("CR", None, "Carriage return"),
+    14: ("SO", None, "Shift out"),
+    15: ("SI", None, "Shift in"),
+    16: ("DLE", None, "Data link escape"),
+    17: ("DC1", None, "Device control 1"),
+    18: ("DC2", None, "Device control 2"),
+    19: ("DC3", None, "Device control 3"),
+    20: ("DC4", None, "Device control 4"),
+    21: ("NAK", None, "Negative acknowledge"),
+    22: ("SYN", None, "Synchronous idle"),
+    23: ("ETB", None, "End of transmission block"),
+    24: ("CAN", None, "Cancel"),
+    25: ("EM", None, "End of medium"),
+    26: ("SUB", None, "Substitute"),
+    27: ("ESC", None, "Escape"),
+    28: ("FS", None, "File separator"),
+    29: ("GS", None, "Group separator"),
+    30: ("RS", None, "Record separator"),
+    31: ("US", None, "Unit separator"),
+    32: ("SPACE", None, "Space"),
+    33: (None, None, "Exclamation mark"),
+    34: (None, "quot", "Double quotes (or speech marks)"),
+    35: (None, None, "Number"),
+    36: (None, None, "Dollar"),
+    37: (None, None, "Procenttecken"),
+    38: (None, "amp", "Ampersand"),
+    39: (None, None, "Single quote"),
+    40: (None, None, "Open parenthesis (or open bracket)"),
+    41: (None, None, "Close parenthesis (or close bracket)"),
+    42: (None, None, "Asterisk"),
+    43: (None, None, "Plus"),
+    44: (None, None, "Comma"),
+    45: (None, None, "Hyphen"),
+    46: (None, None, "Period, dot or full stop"),
+    47: (None, None, "Slash or divide"),
+    48: (None, None, "Zero"),
+    49: (None, None, "One"),
+    50: (None, None, "Two"),
+    51: (None, None, "Three"),
+    52: (None, None, "Four"),
+    53: (None, None, "Five"),
+    54: (None, None, "Six"),
+    55: (None, None, "Seven"),
+    56: (None, None, "Eight"),
+    57: (None, None, "Nine"),
+    58: (None, None, "Colon"),
+    59: (None, None, "Semicolon"),
+    60: (None, "lt", "Less than (or open angled bracket)"),
+    61: (None, None, "Equals"),
+    62: (None, "gt", "Greater than (or close angled bracket)"),
+    63: (None, None, "Question mark"),
+    64: (None, None, "At symbol"),
+    65: (None, None, "Uppercase A"),
+    66: (None, None, "Uppercase B"),
+    67: (None, None, "Uppercase C"),
+    68: (None, None, "Uppercase D"),
+    69: (None, None, "Uppercase E"),
+    70: (None, None, "Uppercase F"),
+    71: (None, None, "Uppercase G"),
+    72: (None, None, "Uppercase H"),
+    73: (None, None, "Uppercase I"),
+    74: (None, None, "Uppercase J"),
+    75: (None, None, "Uppercase K"),
+    76: (None, None, "Uppercase L"),
+    77: (None, None, "Uppercase M"),
+    78: (None, None, "Uppercase N"),
+    79: (None, None, "Uppercase O"),
+    80: (None, None, "Uppercase P"),
+    81: (None, None, "Uppercase Q"),
+    82: (None, None, "Uppercase R"),
+    83: (None, None, "Uppercase S"),
+    84: (None, None, "Uppercase T"),
+    85: (None, None, "Uppercase U"),
+    86: (None, None, "Uppercase V"),
+    87: (None, None, "Uppercase W"),
+    88: (None, None, "Uppercase X"),
+    89: (None, None, "Uppercase Y"),
+    90: (None, None, "Uppercase Z"),
+    91: (None, None, "Opening bracket"),
+    92: (None, None, "Backslash"),
+    93: (None, None, "Closing bracket"),
+    94: (None, None, "Caret - circumflex"),
+    95: (None, None, "Underscore"),
+    96: (None, None, "Grave accent"),
+    97: (None, None, "Lowercase a"),
+    98: (None, None, "Lowercase b"),
+    99: (None, None, "Lowercase c"),
+    100: (None, None, "Lowercase d"),
+    101: (None, None, "Lowercase e"),
+    102: (None, None, "Lowercase f"),
+    103: (None, None, "Lowercase g"),
+    104: (None, None, "Lowercase h"),
+    105: (None, None, "Lowercase i"),
+    106: (None, None, "Lowercase j"),
+    107: (None, None, "Lowercase k"),
+    108: (None, None, "Lowercase l"),
+    109: (None, None, "Lowercase m"),
+    110: (None, None, "Lowercase n"),
+    111: (None, None, "Lowercase o"),
+    112: (None, None, "Lowercase p"),
+    113: (None, None, "Lowercase q"),
+    114: (None, None, "Lowercase r"),
+    115: (None, None, "Lowercase s"),
+    116: (None, None, "Lowercase t"),
+    117: (None, None, "Lowercase u"),
+    118: (None, None, "Lowercase v"),
+    119: (None, None, "Lowercase w"),
+    120: (None, None, "Lowercase x"),
+    121: (None, None, "Lowercase y"),
+    122: (None, None, "Lowercase z"),
+    123: (None, None, "Opening brace"),
+    124: (None, None, "Vertical bar"),
+    125: (None, None, "Closing brace"),
+    126: (None, None, "Equivalency sign - tilde"),
+    127: ("DEL", None, "Delete"),
+    128: ("€", "euro", "Euro sign"),
+    # 129: (" ", None, " "),
+    130: ("‚", "sbquo", "Single low-9 quotation mark"),
+    131: ("ƒ", "fnof", "Latin small letter f with hook"),
+    132: ("„", "bdquo", "Double low-9 quotation mark"),
+    133: ("…", "hellip", "Horizontal ellipsis"),
+    134: ("†", "dagger", "Dagger"),
+    135: ("‡", "Dagger", "Double dagger"),
+    136: ("ˆ", "circ", "Modifier letter circumflex accent"),
+    137: ("‰", "permil", "Per mille sign"),
+    138: ("Š", "Scaron", "Latin capital letter S with caron"),
+    139: ("‹", "lsaquo", "Single left-pointing angle quotation"),
+    140: ("Œ", "OElig", "Latin capital ligature OE"),
+    # 141: (" ", None, " "),
+    142: ("Ž", None, "Latin captial letter Z with caron"),
+    # 143: (" ", None, " "),
+    # 144: (" ", None, " "),
+    145: ("‘", "lsquo", "Left single quotation mark"),
+    146: ("’", "rsquo", "Right single quotation mark"),
+    147: ("“", "ldquo", "Left double quotation mark"),
+    148: ("”", "rdquo", "Right double quotation mark"),
+    149: ("•", "bull", "Bullet"),
+    150: ("–", "ndash", "En dash"),
+    151: ("—", "mdash", "Em dash"),
+    152: ("˜", "tilde", "Small tilde"),
+    153: ("™", "trade", "Trade mark sign"),
+    154: ("š", "scaron", "Latin small letter S with caron"),
+    155: ("›", "rsaquo", "Single right-pointing angle quotation mark"),
+    156: ("œ", "oelig", "Latin small ligature oe"),
+    # 157: (" ", None, " "),
+    158: ("ž", None, "Latin small letter z with caron"),
+    159: ("Ÿ", "yuml", "Latin capital letter Y with diaeresis"),
+    160: (" ", "nbsp", "Non-breaking space"),
+    161: ("¡", "iexcl", "Inverted exclamation mark"),
+    162: ("¢", "cent", "Cent sign"),
+    163: ("£", "pound", "Pound sign"),
+    164: ("¤", "curren", "Currency sign"),
+    165: ("¥", "yen", "Yen sign"),
+    166: ("¦", "brvbar", "Pipe, Broken vertical bar"),
+    167: ("§", "sect", "Section sign"),
+    168: ("¨", "uml", "Spacing diaeresis - umlaut"),
+    169: ("©", "copy", "Copyright sign"),
+    170: ("ª", "ordf", "Feminine ordinal indicator"),
+    171: ("«", "laquo", "Left double angle quotes"),
+    172: ("¬", "not", "Not sign"),
+    173: ("­", "shy", "Soft hyphen"),
+    174: ("®", "reg", "Registered trade mark sign"),
+    175: ("¯", "macr", "Spacing macron - overline"),
+    176: ("°", "deg", "Degree sign"),
+    177: ("±", "plusmn", "Plus-or-minus sign"),
+    178: ("²", "sup2", "Superscript two - squared"),
+    179: ("³", "sup3", "Superscript three - cubed"),
+    180: ("´", "acute", "Acute accent - spacing acute"),
+    181: ("µ", "micro", "Micro sign"),
+    182: ("¶", "para", "Pilcrow sign - paragraph sign"),
+    183: ("·", "middot", "Middle dot - Georgian comma"),
+    184: ("¸", "cedil", "Spacing cedilla"),
+    185: ("¹", "sup1", "Superscript one"),
+    186: ("º", "ordm", "Masculine ordinal indicator"),
+    187: ("»", "raquo", "Right double angle quotes"),
+    188: ("¼", "frac14", "Fraction one quarter"),
+    189: ("½", "frac12", "Fraction one half"),
+    190: ("¾", "frac34", "Fraction three quarters"),
+    191: ("¿", "iquest", "Inverted question mark"),
+    192: ("À", "Agrave", "Latin capital letter A with grave"),
+    193: ("Á", "Aacute", "Latin capital letter A with acute"),
+    194: ("Â", "Acirc", "Latin capital letter A with circumflex"),
+    195: ("Ã", "Atilde", "Latin capital letter A with tilde"),
+    196: ("Ä", "Auml", "Latin capital letter A with diaeresis"),
+    197: ("Å", "Aring", "Latin capital letter A with ring above"),
+    198: ("Æ", "AElig", "Latin capital letter AE"),
+    199: ("Ç", "Ccedil", "Latin capital letter C with cedilla"),
+    200: ("È", "Egrave", "Latin capital letter E with grave"),
+    201: ("É", "Eacute", "Latin capital letter E with acute"),
+    202: ("Ê", "Ecirc", "Latin capital letter E with circumflex"),
+    203: ("Ë", "Euml", "Latin capital letter E with diaeresis"),
+    204: ("Ì", "Igrave", "Latin capital letter I with grave"),
+    205: ("Í", "Iacute", "Latin capital letter I with acute"),
+    206: ("Î", "Icirc", "Latin capital letter I with circumflex"),
+    207: ("Ï", "Iuml", "Latin capital letter I with diaeresis"),
+    208: ("Ð", "ETH", "Latin capital letter ETH"),
+    209: ("Ñ", "Ntilde", "Latin capital letter N with tilde"),
+    210: ("Ò", "Ograve", "Latin capital letter O with grave"),
+    211: ("Ó", "Oacute", "Latin capital letter O with acute"),
+    212: ("Ô", "Ocirc", "Latin capital letter O with circumflex"),
+    213: ("Õ", "Otilde", "Latin capital letter O with tilde"),
+    214: ("Ö", "Ouml", "Latin capital letter O with diaeresis"),
+    215: ("×", "times", "Multiplication sign"),
+    216: ("Ø", "Oslash", "Latin capital letter O with slash"),
+    217: ("Ù", "Ugrave", "Latin capital letter U with grave"),
+    218: ("Ú", "Uacute", "Latin capital letter U with acute"),
+    219: ("Û", "Ucirc", "Latin capital letter U with circumflex"),
+    220: ("Ü", "Uuml", "Latin capital letter U with diaeresis"),
+    221: ("Ý", "Yacute", "Latin capital letter Y with acute"),
+    222: ("Þ", "THORN", "Latin capital letter THORN"),
+    223: ("ß", "szlig", "Latin small letter sharp s - ess-zed"),
+    224: ("à", "agrave", "Latin small letter a with grave"),
+    225: ("á", "aacute", "Latin small letter a with acute"),
+    226: ("â", "acirc", "Latin small letter a with circumflex"),
+    227: ("ã", "atilde", "Latin small letter a with tilde"),
+    228: ("ä", "auml", "Latin small letter a with diaeresis"),
+    229: ("å", "aring", "Latin small letter a with ring above"),
+    230: ("æ", "aelig", "Latin small letter ae"),
+    231: ("ç", "ccedil", "Latin small letter c with cedilla"),
+    232: ("è", "egrave", "Latin small letter e with grave"),
+    233: ("é", "eacute", "Latin small letter e with acute"),
+    234: ("ê", "ecirc", "Latin small letter e with circumflex"),
+    235: ("ë", "euml", "Latin small letter e with diaeresis"),
+    236: ("ì", "igrave", "Latin small letter i with grave"),
+    237: ("í", "iacute", "Latin small letter i with acute"),
+    238: ("î", "icirc", "Latin small letter i with circumflex"),
+    239: ("ï", "iuml", "Latin small letter i with diaeresis"),
+    240: ("ð", "eth", "Latin small letter eth"),
+    241: ("ñ", "ntilde", "Latin small letter n with tilde"),
+    242: ("ò", "ograve", "Latin small letter o with grave"),
+    243: ("ó", "oacute", "Latin small letter o with acute"),
+    244: ("ô", "ocirc", "Latin small letter o with circumflex"),
+    245: ("õ", "otilde", "Latin small letter o with tilde"),
+    246: ("ö", "ouml", "Latin small letter o with diaeresis"),
+    247: ("÷", "divide", "Division sign"),
+    248: ("ø", "oslash", "Latin small letter o with slash"),
+    249: ("ù", "ugrave", "Latin small letter u with grave"),
+    250: ("ú", "uacute", "Latin small letter u with acute"),
+    251: ("û", "ucirc", "Latin small letter u with circumflex"),
+    252: ("ü", "uuml", "Latin small letter u with diaeresis"),
+    253: ("ý", "yacute", "Latin small letter y with acute"),
+    254: ("þ", "thorn", "Latin small letter thorn"),
+    255: ("ÿ", "yuml", "Latin small letter y with diaeresis"),
 }
 
 ASCII_HEADER = "DEC    HEX     OCT      CHR      HTML        DESCRIPTION\n"
 ASCII_LINE = "%-3d    0x%02x    0o%03o    %-5s%s    %-8s%s"
 
+# The Unicode table is shown a page of code points at a time.
+# Only a few rendered pages are kept around, so going back and forth is instant.
+UNICODE_PAGE_SIZE = 256
+UNICODE_PAGES = 0x110000 // UNICODE_PAGE_SIZE
+UNICODE_PAGE_CACHE = 16
+# Characters that wouldn't show up (or would mess up the table) on their own.
+UNICODE_MARKS = ('Mn', 'Me')
+UNICODE_HIDDEN = ('Cc', 'Cf', 'Zl', 'Zp')
+# Words in character names that keep their case, like the letters themselves.
+UNICODE_ACRONYMS = frozenset(('APL', 'ASCII', 'ATM', 'CD', 'CJK', 'DVD', 'IPA', 'OCR', 'SOS', 'TV'))
+UNICODE_LETTER_KINDS = ('LETTER', 'LIGATURE')
+
+# Code page tables are generated from the codec the first time they are shown.
+CODE_PAGE_CACHE = 8
+
+# The Unicode search index is built once and kept in the cache directory.
+# Bump the version when the index format (or what goes into it) changes.
+UNICODE_INDEX_VERSION = 3
+UNICODE_INDEX_FILE = "unicode_index.json"
+UNICODE_SEARCH_LIMIT = 1000
+# Fixed width decimal and hex (padded to at least 4 digits, like `U+XXXX`) for each character,
+# so a match's position gives the character.
+UNICODE_NUMBER = "%-7d %-6s\n"
+UNICODE_NUMBER_WIDTH = 15
+
+unicode_index = None
+unicode_index_thread = None
+unicode_index_callbacks = []
+
+# Hexdumps show a page of bytes at a time, one byte per row, straight from a memory map of the file.
+HEXDUMP_PAGE_SIZE = 4096
+HEXDUMP_HEADER = "OFFSET        " + ASCII_HEADER
+HEXDUMP_LINE = "%010x    %s"
+# Bytes that aren't in the ASCII table.
+HEXDUMP_UNDEFINED = ("-", None, "Undefined")
+
+hexdump_maps = {}
+
+# Character under the cursor in the status bar.
+INSPECT_STATUS = "ascii_table.character"
+INSPECT_DELAY = 50
+INSPECT_CACHE = 1024
+
+settings = None
+show_character_info = False
+inspect_generations = {}
+inspect_shown = {}
+
+# `\xNN` (a byte in the ASCII table), `&#NNN;`, `&#xXXXX;`, `&name;`, and `U+XXXX`.
+RE_ESCAPE = re.compile(
+    r'\\x([\da-fA-F]{2})|&#(\d{1,7});|&#[xX]([\da-fA-F]{1,6});|&([A-Za-z][A-Za-z\d]{1,31});|\b[Uu]\+([\da-fA-F]{4,6})\b'
+)
+
+
+def ascii_columns(code, entry):
+    """Get the DEC, HEX, OCT, CHR, HTM, and INF columns of a table row from a `(char, html_name, info)` entry."""
+
+    char, html_name, info = entry
+    return (
+        str(code),
+        hex(code)[2:],
+        oct(code)[2:],
+        chr(code) if char is None else char,
+        "" if html_name is None else "&%s;" % html_name,
+        info
+    )
 
-def display_ascii(code):
-    """Format and return ASCII line."""
 
-    entry = ASCII_INFO[code]
-    char = entry.get("char", chr(code))
-    info = ("    (%s)" % entry.get("info", ""))
-    html_name = entry.get("html_name", "")
-    if html_name != "":
-        html_name = "&%s;" % html_name
+def display_ascii(code, columns):
+    """Format and return ASCII line."""
 
     spacer = " " if code == 173 else ""
 
     return (
         ASCII_LINE % (
-            code,       # decimal
-            code,       # hex
-            code,       # octal
-            char,       # char
-            spacer,     # spacer
-            html_name,  # HTML name
-            info        # info
+            code,               # decimal
+            code,               # hex
+            code,               # octal
+            columns[CHR],       # char
+            spacer,             # spacer
+            columns[HTM],       # HTML name
+            "    (%s)" % columns[INF]   # info
         )
     ).rstrip()
 
 
-def get_ascii_info(code, info_type):
-    """Get ASCII table info."""
-
-    value = None
-    entry = ASCII_INFO[code]
-    if info_type == DEC:
-        value = str(code)
-    elif info_type == HEX:
-        value = hex(code)[2:]
-    elif info_type == OCT:
-        value = oct(code)[2:]
-    elif info_type == CHR:
-        value = entry.get("char", chr(code))
-    elif info_type == HTM:
-        value = entry.get("html_name", "")
-        if value != "":
-            value = "&%s;" % value
-    elif info_type == INF:
-        value = entry.get("info", "")
-    return value
+class CharTable(object):
+    """
+    A rendered character table.
+
+    The rendered rows double as the search panel's items, and `offsets` has the point where each row
+    starts in the rendered text, so a panel selection goes straight to its row.
+    """
+
+    def __init__(self, entries):
+        """Build the table from `(code, entry)` pairs."""
+
+        codes = []
+        lines = []
+        offsets = array('I')
+        offset = len(ASCII_HEADER)
+        for code, entry in entries:
+            line = display_ascii(code, ascii_columns(code, entry))
+            codes.append(code)
+            lines.append(line)
+            offsets.append(offset)
+            offset += len(line) + 1
+        self.codes = tuple(codes)
+        self.lines = tuple(lines)
+        self.offsets = offsets
+        self.text = ASCII_HEADER + '\n'.join(lines)
+
+    def row(self, code):
+        """Get the row of a code point, or `None` if it isn't in the table."""
+
+        index = bisect.bisect_left(self.codes, code)
+        return index if index < len(self.codes) and self.codes[index] == code else None
+
+
+@functools.lru_cache(maxsize=None)
+def ascii_table():
+    """Get the ASCII table."""
+
+    return CharTable((code, ASCII_INFO[code]) for code in sorted(ASCII_INFO))
+
+
+def code_page_name(encoding):
+    """Get the codec's canonical name (so aliases share a table), or `None` if Python doesn't know the encoding."""
+
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return None
+
+
+def decode_byte(code, encoding):
+    """Decode a single byte, or return `None` if the codec can't."""
+
+    try:
+        return bytes([code]).decode(encoding)
+    except (LookupError, UnicodeError):
+        # Codecs that aren't text encodings (`hex`, `zlib`, ...) raise `LookupError`.
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def is_code_page(encoding):
+    """
+    Check if a codec is a single byte code page.
+
+    It must decode bytes above 0x7f on their own, which rules out `utf-8`, `utf-16`, `idna`, etc.
+    """
+
+    return any(len(decode_byte(code, encoding) or "") == 1 for code in range(0x80, 256))
+
+
+@functools.lru_cache(maxsize=CODE_PAGE_CACHE)
+def code_page_table(encoding):
+    """Get the table of a single byte code page, leaving out the bytes it doesn't define."""
+
+    entries = []
+    for code in range(256):
+        char = decode_byte(code, encoding)
+        if char is None:
+            continue
+        entry = unicode_entry(ord(char)) if len(char) == 1 else None
+        if entry is not None:
+            if entry[0] is None:
+                # The ASCII table leaves its printable characters to be shown from the code,
+                # which is only the character when the code page puts it in the same place.
+                entry = (char,) + entry[1:]
+            entries.append((code, entry))
+    return CharTable(entries)
+
+
+def ascii_view_table(view):
+    """Get the table shown in an ASCII table view."""
+
+    settings = view.settings()
+    if settings.get("ascii_table.unicode", False):
+        return unicode_page(settings.get("ascii_table.page", 0))
+    encoding = settings.get("ascii_table.encoding")
+    return code_page_table(encoding) if encoding else ascii_table()
+
+
+def unicode_entry(code):
+    """
+    Get the `(char, html_name, info)` entry for a Unicode code point, or `None` if it isn't a named character.
+
+    The ASCII table's own entries are used where they describe the same character.
+    """
+
+    char = chr(code)
+    entry = ASCII_INFO.get(code)
+    if entry is not None and (code < 128 or entry[0] in (None, char)):
+        return entry
+
+    category = unicodedata.category(char)
+    name = unicodedata.name(char, "")
+    if not name:
+        if category != 'Cc':
+            return None
+        name = "Control character"
+    if category in UNICODE_MARKS:
+        # Show combining marks on a dotted circle.
+        char = "\u25cc" + char
+    elif category in UNICODE_HIDDEN:
+        char = "-"
+    return (char, codepoint2name.get(code), unicode_name(name))
+
+
+def unicode_name(name):
+    """
+    Write a Unicode character name in sentence case, like the ASCII table's descriptions.
+
+    Letters, acronyms, and numbers keep their case (`Latin capital letter A with macron`, `CJK unified
+    ideograph-4E00`). A letter's name follows its case: as is for Latin capitals (`Latin capital ligature OE`),
+    capitalized for the other capitals (`Greek capital letter Alpha`), and lowercase for small letters.
+    """
+
+    tokens = re.split(r'([ -])', name)
+    words = tokens[::2]
+    letter = None
+    for i, word in enumerate(words):
+        if word == 'WITH':
+            letter = None
+        elif i >= 2 and words[i - 1] in UNICODE_LETTER_KINDS and words[i - 2] in ('CAPITAL', 'SMALL'):
+            letter = words[i - 2]
+        if letter == 'SMALL':
+            word = word.lower()
+        elif letter == 'CAPITAL':
+            if words[0] != 'LATIN':
+                word = word.capitalize()
+        elif len(word) > 1 and word not in UNICODE_ACRONYMS and not any(c.isdigit() for c in word):
+            word = word.capitalize() if i == 0 else word.lower()
+        tokens[i * 2] = word
+    return ''.join(tokens)
+
+
+@functools.lru_cache(maxsize=UNICODE_PAGE_CACHE)
+def unicode_page(page):
+    """Get a page of the Unicode table."""
+
+    entries = []
+    for code in range(page * UNICODE_PAGE_SIZE, (page + 1) * UNICODE_PAGE_SIZE):
+        entry = unicode_entry(code)
+        if entry is not None:
+            entries.append((code, entry))
+    return CharTable(entries)
+
+
+@functools.lru_cache(maxsize=None)
+def unicode_page_is_empty(page):
+    """Check if a page of the Unicode table has no characters (without rendering it)."""
+
+    return not any(
+        unicode_entry(code) is not None
+        for code in range(page * UNICODE_PAGE_SIZE, (page + 1) * UNICODE_PAGE_SIZE)
+    )
+
+
+def parse_code_point(value):
+    """
+    Get the code point from user input, or `None` if it can't be parsed.
+
+    Accepts `U+XXXX` or `0xXXXX` (hexadecimal), decimal, a single character, or a character name.
+    """
+
+    value = value.strip()
+    try:
+        if value[:2].lower() in ('u+', '0x'):
+            code = int(value[2:], 16)
+        elif value.isdigit():
+            code = int(value)
+        elif len(value) == 1:
+            code = ord(value)
+        else:
+            code = ord(unicodedata.lookup(value))
+    except (ValueError, KeyError):
+        return None
+    return code if 0 <= code < 0x110000 else None
+
+
+class UnicodeIndex(object):
+    """
+    Substring search over the Unicode table's decimal and hex code points, HTML entity names, and character names.
+
+    Names and entities are split into words, and each distinct word has a posting list of the characters
+    that use it.  A search term is looked for in the (small) vocabulary and in a fixed width block of the
+    code points, rather than in every character's description.
+    """
+
+    def __init__(self, codes, words, offsets, postings):
+        """Set up the index from its stored parts."""
+
+        self.codes = codes
+        self.words = words
+        self.offsets = offsets
+        self.postings = postings
+        self.numbers = ''.join([UNICODE_NUMBER % (code, "%04x" % code) for code in codes])
+        self.starts = array('I')
+        start = 0
+        for word in words.split('\n'):
+            self.starts.append(start)
+            start += len(word) + 1
+
+    @classmethod
+    def build(cls):
+        """Build the index from `unicodedata`."""
+
+        codes = array('I')
+        vocabulary = {}
+        for code in range(0x110000):
+            entry = unicode_entry(code)
+            if entry is None:
+                continue
+            char, html_name, info = entry
+            words = set(info.lower().replace('-', ' ').split())
+            # Names like "CJK unified ideograph-4E00" end with the hex, which is searched separately.
+            words.discard("%04x" % code)
+            if html_name is not None:
+                words.add("&%s;" % html_name)
+            for word in words:
+                vocabulary.setdefault(word, array('I')).append(len(codes))
+            codes.append(code)
+
+        words = sorted(vocabulary)
+        offsets = array('I', [0])
+        postings = array('I')
+        for word in words:
+            postings.extend(vocabulary[word])
+            offsets.append(len(postings))
+        return cls(codes, '\n'.join(words), offsets, postings)
+
+    @staticmethod
+    def version():
+        """Get what the cached index must have been built with to be used."""
+
+        return [UNICODE_INDEX_VERSION, unicodedata.unidata_version, sys.byteorder, array('I').itemsize]
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load the index from the cache, or return `None` if it isn't there, is out of date, or is damaged.
+
+        The cache is plain JSON, with the arrays' bytes in base64, so reading it can't run any code.
+        """
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data["version"] != cls.version():
+                return None
+            parts = []
+            for name in ("codes", "offsets", "postings"):
+                part = array('I')
+                part.frombytes(base64.b64decode(data[name].encode('ascii'), validate=True))
+                parts.append(part)
+            codes, offsets, postings = parts
+            words = data["words"]
+            if (
+                not isinstance(words, str) or len(offsets) != words.count('\n') + 2 or
+                offsets[-1] != len(postings) or (postings and max(postings) >= len(codes))
+            ):
+                return None
+        except Exception:
+            return None
+        return cls(codes, words, offsets, postings)
+
+    def save(self, path):
+        """Save the index to the cache."""
+
+        data = {
+            "version": self.version(),
+            "codes": base64.b64encode(self.codes.tobytes()).decode('ascii'),
+            "words": self.words,
+            "offsets": base64.b64encode(self.offsets.tobytes()).decode('ascii'),
+            "postings": base64.b64encode(self.postings.tobytes()).decode('ascii')
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def find(self, term):
+        """Get the indexes of the characters that have the term in one of their fields."""
+
+        found = set()
+        pos = self.words.find(term)
+        while pos != -1:
+            word = bisect.bisect_right(self.starts, pos) - 1
+            found.update(self.postings[self.offsets[word]:self.offsets[word + 1]])
+            pos = self.words.find(term, self.starts[word + 1]) if word + 1 < len(self.starts) else -1
+
+        pos = self.numbers.find(term)
+        while pos != -1:
+            found.add(pos // UNICODE_NUMBER_WIDTH)
+            pos = self.numbers.find(term, (pos // UNICODE_NUMBER_WIDTH + 1) * UNICODE_NUMBER_WIDTH)
+        return found
+
+    def search(self, query, limit=UNICODE_SEARCH_LIMIT):
+        """Get the code points (in order) that match every term in the query."""
+
+        terms = set()
+        for term in query.replace('-', ' ').split():
+            # HTML entity names are case sensitive (`&Eacute;` isn't `&eacute;`).
+            if not term.startswith('&'):
+                term = term.lower()
+                if term[:2] in ('u+', '0x') and len(term) > 2:
+                    term = term[2:]
+            terms.add(term)
+
+        found = None
+        for term in sorted(terms, key=len, reverse=True):
+            matches = self.find(term)
+            found = matches if found is None else found & matches
+            if not found:
+                break
+        return [self.codes[index] for index in sorted(found or ())[:limit]]
+
+
+def unicode_index_path():
+    """Get the path of the cached Unicode search index."""
+
+    return os.path.join(sublime.cache_path(), "SublimeRandomCrap", UNICODE_INDEX_FILE)
+
+
+def load_unicode_index(callback=None):
+    """
+    Get the Unicode search index, or `None` if it isn't loaded yet.
+
+    The first call loads (or builds) the index in the background, and the callback
+    is run on the main thread once it is ready.
+    """
+
+    global unicode_index_thread
+
+    if unicode_index is not None:
+        return unicode_index
+    if callback is not None:
+        unicode_index_callbacks.append(callback)
+    if unicode_index_thread is None:
+        unicode_index_thread = threading.Thread(target=build_unicode_index)
+        unicode_index_thread.daemon = True
+        unicode_index_thread.start()
+    return None
+
+
+def build_unicode_index():
+    """Load the Unicode search index from the cache, or build and cache it."""
+
+    path = unicode_index_path()
+    index = UnicodeIndex.load(path)
+    if index is None:
+        index = UnicodeIndex.build()
+        try:
+            index.save(path)
+        except Exception as e:
+            print("ASCII Table: could not save the Unicode search index: %s" % e)
+
+    def ready():
+        global unicode_index
+        unicode_index = index
+        callbacks = unicode_index_callbacks[:]
+        del unicode_index_callbacks[:]
+        for callback in callbacks:
+            callback()
+
+    sublime.set_timeout(ready, 0)
+
+
+@functools.lru_cache(maxsize=None)
+def hexdump_rows():
+    """Get the ASCII table row of every byte value."""
+
+    return tuple(
+        display_ascii(code, ascii_columns(code, ASCII_INFO.get(code, HEXDUMP_UNDEFINED))) for code in range(256)
+    )
+
+
+def hexdump_map(view):
+    """Get the memory map of the file in a hexdump view (mapped on first use)."""
+
+    data = hexdump_maps.get(view.id())
+    if data is None:
+        with open(view.settings().get("ascii_table.hexdump"), 'rb') as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped.
+                data = b''
+        hexdump_maps[view.id()] = data
+    return data
+
+
+def hexdump_close(view_id):
+    """Release a hexdump view's memory map."""
+
+    data = hexdump_maps.pop(view_id, None)
+    if isinstance(data, mmap.mmap):
+        data.close()
+
+
+def hexdump_page(data, page):
+    """Render a page of a hexdump."""
+
+    rows = hexdump_rows()
+    start = page * HEXDUMP_PAGE_SIZE
+    chunk = data[start:start + HEXDUMP_PAGE_SIZE]
+    return HEXDUMP_HEADER + '\n'.join([HEXDUMP_LINE % (offset, rows[byte]) for offset, byte in enumerate(chunk, start)])
+
+
+def hexdump_pages(data):
+    """Get the number of pages in a hexdump."""
+
+    return max(1, (len(data) + HEXDUMP_PAGE_SIZE - 1) // HEXDUMP_PAGE_SIZE)
+
+
+def parse_offset(value):
+    """Get a byte offset from user input (`0x` hexadecimal or decimal), or `None` if it can't be parsed."""
+
+    value = value.strip()
+    try:
+        return int(value[2:], 16) if value[:2].lower() == '0x' else int(value)
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def escape_maps():
+    """
+    Get the lookups used to decode escapes.
+
+    Returns the character of each byte in the ASCII table, and the code point of each HTML entity name.
+    """
+
+    byte_chars = []
+    for code in range(256):
+        entry = ASCII_INFO.get(code)
+        char = entry[0] if entry is not None and code >= 128 else None
+        byte_chars.append(char if char is not None and len(char) == 1 else chr(code))
+
+    html_codes = dict(name2codepoint)
+    for code, (char, html_name, info) in ASCII_INFO.items():
+        if html_name is not None:
+            html_codes.setdefault(html_name, ord(byte_chars[code]))
+    return tuple(byte_chars), html_codes
+
+
+def decode_escape(m):
+    """Get the character and `(char, html_name, info)` entry of an escape match, or `None` if it isn't valid."""
+
+    byte_chars, html_codes = escape_maps()
+    if m.group(1):
+        code = int(m.group(1), 16)
+        if code not in ASCII_INFO:
+            # The bytes the ASCII table leaves undefined (0x81, 0x8d, ...) don't stand for a character.
+            return None
+        return byte_chars[code], ASCII_INFO[code]
+    if m.group(2):
+        code = int(m.group(2))
+    elif m.group(3):
+        code = int(m.group(3), 16)
+    elif m.group(4):
+        code = html_codes.get(m.group(4))
+    else:
+        code = int(m.group(5), 16)
+    # Surrogates can't be put in the buffer on their own, and HTML doesn't allow `&#0;`.
+    if code is None or code >= 0x110000 or 0xD800 <= code <= 0xDFFF or (code == 0 and m.group(5) is None):
+        return None
+    entry = unicode_entry(code)
+    return chr(code), (None, None, "Unassigned") if entry is None else entry
+
+
+def convert_escapes(text, annotate=False):
+    """
+    Decode (or annotate) all the escapes in the text.
+
+    Returns the new text and the number of escapes converted.  Invalid escapes are left alone.
+    """
+
+    count = [0]
+    # Files tend to use the same few escapes over and over.
+    converted = {}
+
+    def convert(m):
+        escape = m.group(0)
+        value = converted.get(escape)
+        if value is None:
+            decoded = decode_escape(m)
+            if decoded is None or (not annotate and decoded[0] == "\x00"):
+                # A NUL is only annotated: it would end up in the file otherwise.
+                value = escape
+            elif annotate:
+                columns = ascii_columns(ord(decoded[0]), decoded[1])
+                value = "%s (%s %s)" % (escape, columns[CHR], columns[INF])
+            else:
+                value = decoded[0]
+            converted[escape] = value
+        if value != escape:
+            count[0] += 1
+        return value
+
+    return RE_ESCAPE.sub(convert, text), count[0]
+
+
+def format_character_status(code):
+    """Format the status bar text for a character."""
+
+    columns = ascii_columns(code, unicode_entry(code) or (None, None, "Unassigned"))
+    return "DEC %d, HEX 0x%02x, OCT 0o%03o%s, %s" % (
+        code, code, code, ", " + columns[HTM] if columns[HTM] else "", columns[INF]
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def latin1_statuses():
+    """Get the status bar text of the first 256 characters."""
+
+    return tuple(format_character_status(code) for code in range(256))
+
+
+@functools.lru_cache(maxsize=INSPECT_CACHE)
+def unicode_status(code):
+    """Get the status bar text of a character outside of the first 256."""
+
+    return format_character_status(code)
+
+
+def character_status(code):
+    """Get the status bar text of a character."""
+
+    return latin1_statuses()[code] if code < 256 else unicode_status(code)
+
+
+def schedule_inspect(view):
+    """Show the character under the cursor once the cursor stops moving."""
+
+    view_id = view.id()
+    generation = inspect_generations.get(view_id, 0) + 1
+    inspect_generations[view_id] = generation
+    sublime.set_timeout(lambda: inspect(view, generation), INSPECT_DELAY)
+
+
+def inspect(view, generation):
+    """Show the character under the first cursor in the status bar."""
+
+    view_id = view.id()
+    if inspect_generations.get(view_id) != generation or not show_character_info or not view.is_valid():
+        return
+    sels = view.sel()
+    char = view.substr(sels[0].b) if len(sels) else ""
+    status = character_status(ord(char)) if char else None
+    if status != inspect_shown.get(view_id):
+        if status is None:
+            view.erase_status(INSPECT_STATUS)
+        else:
+            view.set_status(INSPECT_STATUS, status)
+        inspect_shown[view_id] = status
+
+
+def clear_inspect():
+    """Remove the character info from all the views."""
+
+    for window in sublime.windows():
+        for view in window.views():
+            if view.id() in inspect_shown:
+                view.erase_status(INSPECT_STATUS)
+    inspect_shown.clear()
+    inspect_generations.clear()
+
+
+def reload_settings():
+    """Load the settings."""
+
+    global show_character_info
+    show_character_info = bool(settings.get("show_character_info", False))
+    if not show_character_info:
+        clear_inspect()
 
 
 class AsciiTableSearchCommand(sublime_plugin.TextCommand):
     """Command to open ASCII table then perform search."""
 
-    def run(self, edit, info_type):
-        """Find or launch an ASCII table view and pop and then call actual search command."""
+    def run(self, edit, info_type=None):
+        """
+        Find or launch an ASCII table view and pop and then call actual search command.
+
+        `info_type` is no longer used: all the columns are searched.
+        """
 
         if not self.view.settings().get("ascii_table.view", False):
             window = self.view.window()
@@ -393,73 +1098,349 @@ class AsciiTableSearchCommand(sublime_plugin.TextCommand):
             ascii_view = self.view
 
         if ascii_view is not None:
-            ascii_view.run_command('ascii_table_view_search', {'info_type': info_type})
+            ascii_view.run_command('ascii_table_view_search')
 
 
 class AsciiTableViewSearchCommand(sublime_plugin.TextCommand):
     """ASCII table search."""
 
-    def run(self, edit, info_type):
-        """Show the palette search options based on `info_type`."""
+    def run(self, edit, info_type=None):
+        """Show the table's rows in the palette (`info_type` is no longer used: all the columns are searched)."""
 
-        info_map = {
-            "dec": DEC,
-            "hex": HEX,
-            "oct": OCT,
-            "chr": CHR,
-            "htm": HTM,
-            "inf": INF
-        }
-        self.info_type = info_map.get(info_type)
-        if self.info_type is not None:
-            self.items = [get_ascii_info(x, self.info_type) for x in range(0, 256) if x in ASCII_INFO]
-            if len(self.items):
-                self.view.window().show_quick_panel(self.items, self.show)
+        # Only the page in view is searched in the Unicode table.
+        self.table = ascii_view_table(self.view)
+        if self.table.lines:
+            self.view.window().show_quick_panel(list(self.table.lines), self.show)
 
     def show(self, value):
         """Set focus to the search result."""
 
         if value != -1:
-            pt = self.view.text_point(value + 1, 0)
+            pt = self.table.offsets[value]
             self.view.sel().clear()
             self.view.sel().add(pt)
             self.view.show_at_center(pt)
 
-    def is_enabled(self, info_type):
+    def is_enabled(self, info_type=None):
         """Enable only if we are in an ASCII table view."""
 
         return self.view.settings().get("ascii_table.view", False)
 
 
 class AsciiTableWriteCommand(sublime_plugin.TextCommand):
-    """Write out the ASCII table."""
+    """Write out the ASCII table (or a code page), or a page of the Unicode table."""
 
-    def run(self, edit):
-        """Insert table in ASCII view."""
+    def run(self, edit, page=None, code=None, encoding=None):
+        """Replace the view's content with the ASCII table, the code page, or the Unicode table's page."""
 
-        self.view.insert(
-            edit, 0,
-            ASCII_HEADER + '\n'.join([display_ascii(x) for x in range(0, 256) if x in ASCII_INFO])
-        )
+        if page is None:
+            table = code_page_table(encoding) if encoding else ascii_table()
+            self.view.settings().set("ascii_table.encoding", encoding or None)
+            self.view.set_name(".ascii_table (%s)" % encoding if encoding else ".ascii_table")
+        else:
+            table = unicode_page(page)
+            self.view.settings().set("ascii_table.page", page)
+            first = page * UNICODE_PAGE_SIZE
+            self.view.set_name(".unicode_table U+%04X-U+%04X" % (first, first + UNICODE_PAGE_SIZE - 1))
+        self.view.set_read_only(False)
+        self.view.replace(edit, sublime.Region(0, self.view.size()), table.text)
+        self.view.set_read_only(True)
+
+        row = None if code is None else table.row(code)
+        pt = 0 if row is None else table.offsets[row]
+        self.view.sel().clear()
+        self.view.sel().add(pt)
+        if row is not None:
+            self.view.show_at_center(pt)
+        else:
+            self.view.set_viewport_position((0, 0), False)
+
+
+class AsciiTableHexdumpWriteCommand(sublime_plugin.TextCommand):
+    """Write out a page of a hexdump."""
+
+    def run(self, edit, page, offset=None):
+        """Replace the hexdump view's content with the page, and put the cursor on the offset (if any)."""
+
+        text = hexdump_page(hexdump_map(self.view), page)
+        self.view.set_read_only(False)
+        self.view.replace(edit, sublime.Region(0, self.view.size()), text)
+        self.view.set_read_only(True)
+        self.view.settings().set("ascii_table.page", page)
+
+        row = 0 if offset is None else offset - page * HEXDUMP_PAGE_SIZE + 1
+        pt = self.view.text_point(row, 0)
+        self.view.sel().clear()
+        self.view.sel().add(pt)
+        if row:
+            self.view.show_at_center(pt)
+        else:
+            self.view.set_viewport_position((0, 0), False)
+
+
+class AsciiTablePageCommand(sublime_plugin.TextCommand):
+    """Move through the Unicode table or a hexdump."""
+
+    def run(self, edit, page, table=None):
+        """
+        Show the `next` or `previous` page with characters on it, or ask for a character to `goto`.
+
+        With a `table` (`unicode` or `hexdump`), the command only applies to that kind of view.
+        """
+
+        if not self.is_enabled(page, table):
+            return
+        if self.table() == "hexdump":
+            self.hexdump(page)
+            return
+
+        if page == "goto":
+            self.view.window().show_input_panel(
+                "Code point (U+XXXX, decimal), character, or name:", "", self.goto, None, None
+            )
+            return
+
+        step = 1 if page == "next" else -1
+        current = self.view.settings().get("ascii_table.page", 0) + step
+        while 0 <= current < UNICODE_PAGES:
+            if not unicode_page_is_empty(current):
+                self.view.run_command("ascii_table_write", {"page": current})
+                return
+            current += step
+        sublime.status_message("ASCII Table: no more characters")
+
+    def goto(self, value):
+        """Show the page with the character."""
+
+        code = parse_code_point(value)
+        if code is None or unicode_entry(code) is None:
+            sublime.status_message("ASCII Table: no character for '%s'" % value)
+            return
+        self.view.window().run_command("ascii_table", {"table": "unicode", "code": code})
+
+    def hexdump(self, page):
+        """Show the `next` or `previous` page of the hexdump, or ask for an offset to `goto`."""
+
+        if page == "goto":
+            self.view.window().show_input_panel("Offset (0xXXXX or decimal):", "", self.goto_offset, None, None)
+            return
+
+        current = self.view.settings().get("ascii_table.page", 0) + (1 if page == "next" else -1)
+        if 0 <= current < hexdump_pages(hexdump_map(self.view)):
+            self.view.run_command("ascii_table_hexdump_write", {"page": current})
+        else:
+            sublime.status_message("ASCII Table: no more bytes")
+
+    def goto_offset(self, value):
+        """Show the page with the offset."""
+
+        offset = parse_offset(value)
+        if offset is None or not 0 <= offset < len(hexdump_map(self.view)):
+            sublime.status_message("ASCII Table: no byte at '%s'" % value)
+            return
+        self.view.run_command("ascii_table_hexdump_write", {"page": offset // HEXDUMP_PAGE_SIZE, "offset": offset})
+
+    def table(self):
+        """Get the kind of paged view: `unicode` or `hexdump`."""
+
+        return "hexdump" if self.view.settings().get("ascii_table.hexdump") else "unicode"
+
+    def is_enabled(self, page, table=None):
+        """Enable only if we are in a Unicode table or hexdump view (of the given kind)."""
+
+        return bool(self.view.settings().get("ascii_table.paged", False)) and table in (None, self.table())
 
 
 class AsciiTableCommand(sublime_plugin.WindowCommand):
     """ASCII table command to show ASCII table."""
 
-    def run(self):
-        """Show the ASCII table.  Only generate if one is not available."""
+    def run(self, table="ascii", code=None, encoding=None):
+        """
+        Show the ASCII (or Unicode) table.  Only generate if one is not available.
 
+        With an `encoding`, the ASCII table shows that code page instead (re-rendering an open table).
+        """
+
+        is_unicode = table == "unicode"
+        page = 0 if code is None else code // UNICODE_PAGE_SIZE
+        if encoding:
+            name = code_page_name(encoding)
+            if name is None:
+                sublime.status_message("ASCII Table: unknown encoding '%s'" % encoding)
+                return
+            if not is_code_page(name):
+                sublime.status_message("ASCII Table: '%s' isn't a single byte code page" % encoding)
+                return
+            encoding = name
         for view in self.window.views():
-            if view.settings().get("ascii_table.view", False):
+            settings = view.settings()
+            if settings.get("ascii_table.view", False) and settings.get("ascii_table.unicode", False) == is_unicode:
                 self.window.focus_view(view)
+                if is_unicode and code is not None:
+                    view.run_command("ascii_table_write", {"page": page, "code": code})
+                elif not is_unicode and encoding is not None:
+                    if (encoding or None) != settings.get("ascii_table.encoding"):
+                        view.run_command("ascii_table_write", {"encoding": encoding})
                 return
 
         view = self.window.new_file()
         if view is not None:
             view.set_encoding("UTF-8")
-            view.run_command("ascii_table_write")
+            if is_unicode:
+                view.settings().set("ascii_table.unicode", True)
+                view.settings().set("ascii_table.paged", True)
+                view.run_command("ascii_table_write", {"page": page, "code": code})
+            else:
+                view.run_command("ascii_table_write", {"encoding": encoding})
             view.set_read_only(True)
             view.set_scratch(True)
-            view.set_name(".ascii_table")
             view.settings().set("ascii_table.view", True)
             view.set_syntax_file("Packages/SublimeRandomCrap/ascii_table")
+
+
+class AsciiTableCodePageCommand(sublime_plugin.WindowCommand):
+    """Show a code page in the ASCII table."""
+
+    def run(self, encoding=None):
+        """Show the code page, or ask for one (leave it empty for the extended ASCII table)."""
+
+        if encoding is None:
+            self.window.show_input_panel("Code page (cp437, latin-1, koi8-r, ...):", "", self.show, None, None)
+        else:
+            self.show(encoding)
+
+    def show(self, encoding):
+        """Show the code page."""
+
+        self.window.run_command("ascii_table", {"encoding": encoding.strip()})
+
+
+class AsciiTableUnicodeSearchCommand(sublime_plugin.WindowCommand):
+    """Search the whole Unicode table."""
+
+    def run(self):
+        """Ask for the search terms once the search index is available."""
+
+        if load_unicode_index(self.run) is None:
+            sublime.status_message("ASCII Table: loading the Unicode search index...")
+            return
+        self.window.show_input_panel("Search Unicode:", "", self.search, None, None)
+
+    def search(self, query):
+        """Show the characters that match."""
+
+        self.codes = unicode_index.search(query)
+        if not self.codes:
+            sublime.status_message("ASCII Table: no characters match '%s'" % query)
+            return
+        items = []
+        for code in self.codes:
+            columns = ascii_columns(code, unicode_entry(code))
+            items.append(["U+%04X    %s" % (code, columns[CHR]), columns[INF]])
+        self.window.show_quick_panel(items, self.show)
+
+    def show(self, value):
+        """Show the character in the Unicode table."""
+
+        if value != -1:
+            self.window.run_command("ascii_table", {"table": "unicode", "code": self.codes[value]})
+
+
+class AsciiTableHexdumpCommand(sublime_plugin.WindowCommand):
+    """Show a hexdump of a file."""
+
+    def run(self, path=None):
+        """Show a hexdump of the file at the path, or ask for one (starting with the current view's file)."""
+
+        if path is None:
+            view = self.window.active_view()
+            current = view.file_name() if view is not None else None
+            self.window.show_input_panel("Hexdump file:", current or "", self.show, None, None)
+        else:
+            self.show(path)
+
+    def show(self, path):
+        """Open the hexdump view.  Only generate if one is not available."""
+
+        path = os.path.abspath(os.path.expanduser(path))
+        if not os.path.isfile(path):
+            sublime.status_message("ASCII Table: can't open '%s'" % path)
+            return
+
+        for view in self.window.views():
+            if view.settings().get("ascii_table.hexdump") == path:
+                self.window.focus_view(view)
+                return
+
+        view = self.window.new_file()
+        if view is not None:
+            view.set_encoding("UTF-8")
+            view.settings().set("ascii_table.hexdump", path)
+            view.settings().set("ascii_table.paged", True)
+            view.set_name(".hexdump %s" % os.path.basename(path))
+            view.run_command("ascii_table_hexdump_write", {"page": 0})
+            view.set_read_only(True)
+            view.set_scratch(True)
+
+
+class AsciiTableEscapesCommand(sublime_plugin.TextCommand):
+    """Decode or annotate escapes."""
+
+    def run(self, edit, annotate=False):
+        """Decode (or annotate) the escapes in the selections, or in the whole file if nothing is selected."""
+
+        regions = [region for region in self.view.sel() if not region.empty()]
+        if not regions:
+            regions = [sublime.Region(0, self.view.size())]
+
+        total = 0
+        # Go backwards so the replacements don't move the regions still to do.
+        for region in reversed(regions):
+            text, count = convert_escapes(self.view.substr(region), annotate)
+            if count:
+                self.view.replace(edit, region, text)
+                total += count
+        sublime.status_message("ASCII Table: %s %d escape(s)" % ("annotated" if annotate else "decoded", total))
+
+
+class AsciiTableListener(sublime_plugin.EventListener):
+    """Show the character under the cursor, and clean up after closed views."""
+
+    def on_selection_modified(self, view):
+        """Show the character under the cursor."""
+
+        if show_character_info:
+            schedule_inspect(view)
+
+    def on_activated(self, view):
+        """Show the character under the cursor."""
+
+        if show_character_info:
+            schedule_inspect(view)
+
+    def on_close(self, view):
+        """Release the view's hexdump."""
+
+        hexdump_close(view.id())
+        inspect_generations.pop(view.id(), None)
+        inspect_shown.pop(view.id(), None)
+
+
+def plugin_loaded():
+    """Load the settings."""
+
+    global settings
+    settings = sublime.load_settings("ascii_table.sublime-settings")
+    settings.clear_on_change('reload')
+    settings.add_on_change('reload', reload_settings)
+    reload_settings()
+
+
+def plugin_unloaded():
+    """Release all the hexdumps, and remove the character info."""
+
+    for view_id in list(hexdump_maps):
+        hexdump_close(view_id)
+    if settings is not None:
+        settings.clear_on_change('reload')
+    clear_inspect()
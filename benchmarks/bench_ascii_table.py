@@ -0,0 +1,101 @@
+"""
+Benchmark ASCII Table outside of Sublime Text.
+
+Measures the import time and memory of the plugin (up to showing the ASCII table), and how long it
+takes to render the tables and the search panel items.  Each import is measured in a fresh interpreter.
+
+```
+python -m benchmarks.bench_ascii_table
+```
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from . import fake_sublime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_SCRIPT = """
+import json, sys, time, tracemalloc
+sys.path.insert(0, %(benchmarks)r)
+sys.path.insert(0, %(root)r)
+import fake_sublime
+fake_sublime.install()
+trace = %(trace)r
+if trace:
+    tracemalloc.start()
+start = time.perf_counter()
+import ascii_table
+ascii_table.AsciiTableWriteCommand(fake_sublime.active_window().new_view()).run(None)
+elapsed = time.perf_counter() - start
+memory = tracemalloc.get_traced_memory()[0] if trace else 0
+with open('/proc/self/status') as f:
+    rss = [int(line.split()[1]) for line in f if line.startswith('VmRSS:')]
+print(json.dumps({'seconds': elapsed, 'memory': memory, 'rss': rss[0] if rss else 0}))
+"""
+
+
+def run_import(trace):
+    """Import the plugin and show the ASCII table in a fresh interpreter."""
+
+    script = IMPORT_SCRIPT % {'benchmarks': os.path.join(ROOT, 'benchmarks'), 'root': ROOT, 'trace': trace}
+    output = subprocess.check_output([sys.executable, '-c', script], cwd=ROOT)
+    return json.loads(output.decode('utf-8'))
+
+
+def measure_import(repeat):
+    """
+    Measure the import in fresh interpreters.
+
+    Tracing memory slows the import down, so the time and the memory are measured in separate runs.
+    """
+
+    result = run_import(True)
+    result['seconds'] = min(run_import(False)['seconds'] for _ in range(repeat))
+    return result
+
+
+def measure(func, repeat):
+    """Time a function and return the fastest run."""
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    """Run the benchmarks."""
+
+    parser = argparse.ArgumentParser(prog='bench_ascii_table', description='Benchmark ASCII Table.')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (the fastest is kept).')
+    args = parser.parse_args(argv)
+
+    result = measure_import(args.repeat)
+    print('Import + show:       %8.2f ms' % (result['seconds'] * 1000))
+    print('Python memory:       %8.1f KB' % (result['memory'] / 1024.0))
+    print('Resident memory:     %8d KB' % result['rss'])
+
+    fake_sublime.install()
+    sys.path.insert(0, ROOT)
+    import ascii_table
+
+    def render():
+        view = fake_sublime.active_window().new_view()
+        ascii_table.AsciiTableWriteCommand(view).run(None)
+        ascii_table.AsciiTableViewSearchCommand(view).run(None)
+
+    fake_sublime.reset()
+    print('ASCII table + search: %7.2f ms' % (measure(render, args.repeat) * 1000))
+    print('Unicode page:        %8.2f ms' % (measure(lambda: ascii_table.unicode_page(0x4e), 1) * 1000))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
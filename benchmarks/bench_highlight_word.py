@@ -0,0 +1,130 @@
+"""
+Benchmark HighlightWord outside of Sublime Text.
+
+Measures how many main thread callbacks the plugin schedules per minute while the editor is idle,
+and the latency between a selection change and the highlight being drawn.
+
+```
+python -m benchmarks.bench_highlight_word
+```
+"""
+import argparse
+import os
+import sys
+import time
+
+from . import fake_sublime
+
+fake_sublime.install()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import highlight_word  # noqa: E402
+
+SEPARATORS = "./\\()\"'-:,.;<>~!@#$%^&*|+=[]{}`~?"
+WORDS = ('alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta', 'eta', 'theta')
+
+
+def make_text(lines, width=8):
+    """Create a synthetic buffer."""
+
+    return '\n'.join(
+        ' '.join(WORDS[(row + col) % len(WORDS)] for col in range(width)) for row in range(lines)
+    ) + '\n'
+
+
+def setup(text):
+    """Load the plugin against a fresh window and view."""
+
+    fake_sublime.reset()
+    settings = fake_sublime.load_settings('highlight_word.sublime-settings')
+    settings.set('highlight_scopes', ['string', 'keyword', 'constant.language'])
+    settings.set('require_word_select', False)
+    view = fake_sublime.active_window().new_view(text, settings={'word_separators': SEPARATORS})
+    fake_sublime.run_main(highlight_word.plugin_loaded)
+    return view
+
+
+def teardown():
+    """Unload the plugin."""
+
+    fake_sublime.run_main(highlight_word.plugin_unloaded)
+
+
+def idle_callbacks(view, seconds, highlighted):
+    """Count main thread callbacks per minute while nothing happens."""
+
+    if highlighted:
+        move_cursor(view, 0)
+        wait_for_highlight(view, 0)
+    fake_sublime.main_loop.idle()
+    before = fake_sublime.callbacks['set_timeout']
+    time.sleep(seconds)
+    return (fake_sublime.callbacks['set_timeout'] - before) * 60.0 / seconds
+
+
+def move_cursor(view, pt):
+    """Move the cursor and fire the selection event like Sublime would."""
+
+    def move():
+        view.sel().clear()
+        view.sel().add(pt)
+        highlight_word.HighlightWordListenerCommand().on_selection_modified(view)
+
+    fake_sublime.run_main(move)
+
+
+def wait_for_highlight(view, count, timeout=5.0):
+    """Wait until more than `count` highlight updates have been drawn and return the time it happened."""
+
+    end = time.time() + timeout
+    while time.time() < end:
+        if len(view.region_log) > count:
+            return view.region_log[count][0]
+        time.sleep(0.0005)
+    raise RuntimeError('Timed out waiting for highlight')
+
+
+def latency(view, keystrokes):
+    """Measure time from selection change to highlight."""
+
+    samples = []
+    pt = 0
+    for _ in range(keystrokes):
+        fake_sublime.main_loop.idle()
+        count = len(view.region_log)
+        pt = view.text.find(' ', pt + 1) + 1
+        start = time.time()
+        move_cursor(view, pt)
+        samples.append(wait_for_highlight(view, count) - start)
+    samples.sort()
+    return samples
+
+
+def main(argv=None):
+    """Run the benchmarks."""
+
+    parser = argparse.ArgumentParser(prog='bench_highlight_word', description='Benchmark HighlightWord.')
+    parser.add_argument('--idle', type=float, default=3.0, help='Seconds to sample idle callbacks.')
+    parser.add_argument('--keystrokes', type=int, default=50, help='Number of selection changes to time.')
+    parser.add_argument('--lines', type=int, default=2000, help='Lines in the synthetic buffer.')
+    args = parser.parse_args(argv)
+
+    view = setup(make_text(args.lines))
+    try:
+        print('Idle callbacks/min (nothing highlighted): %.1f' % idle_callbacks(view, args.idle, False))
+        print('Idle callbacks/min (word highlighted):    %.1f' % idle_callbacks(view, args.idle, True))
+        samples = latency(view, args.keystrokes)
+        print(
+            'Selection to highlight latency: mean %.1f ms, p50 %.1f ms, max %.1f ms' % (
+                sum(samples) * 1000 / len(samples),
+                samples[len(samples) // 2] * 1000,
+                samples[-1] * 1000
+            )
+        )
+    finally:
+        teardown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
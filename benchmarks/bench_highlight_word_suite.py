@@ -0,0 +1,320 @@
+"""
+Headless benchmark suite for HighlightWord.
+
+Runs `HighlightWord.do_search` (full searches, scrolling, pinned words, ignored scopes, and match counts)
+and `HighlightWordSelectCommand` against synthetic buffers in the in-memory `sublime` stand-in, with different sizes,
+word densities, and selection counts, plus a large buffer that doesn't repeat where the words are only at the top.
+Wall time and the number of View API calls are reported for each case, and compared against the stored baselines
+in `baselines.json`.
+
+The regions drawn, the selections made, and the matches counted are recorded too, and must match the
+baselines exactly, so a change that drops (or adds) matches fails. API call counts are deterministic and
+must not go up. Wall times depend on the machine, so they are only checked against a tolerance, and the
+baselines should be updated when moving to another machine.
+
+```
+python -m benchmarks.bench_highlight_word_suite            # Run and compare against the baselines
+python -m benchmarks.bench_highlight_word_suite --update   # Run and store new baselines
+python -m benchmarks.bench_highlight_word_suite --full     # Include the 100 MB buffers
+```
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from . import fake_sublime
+
+fake_sublime.install()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import highlight_word  # noqa: E402
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+SEPARATORS = "./\\()\"'-:,.;<>~!@#$%^&*|+=[]{}`~?"
+NEEDLES = ('needle', 'haystack', 'pin')
+SIZES = (
+    ('10KB', 10 * 1024),
+    ('1MB', 1024 * 1024),
+    ('10MB', 10 * 1024 * 1024)
+)
+FULL_SIZES = SIZES + (('100MB', 100 * 1024 * 1024),)
+DENSITIES = (
+    ('sparse', 0.001),
+    ('dense', 0.05)
+)
+SELECTIONS = (1, 3)
+# A large buffer that doesn't repeat, with the needles only on the first line.
+RARE_SIZES = (
+    ('32MB', 32 * 1024 * 1024),
+)
+FULL_RARE_SIZES = RARE_SIZES + (('128MB', 128 * 1024 * 1024),)
+PINS = 200
+BLOCK_SIZE = 64 * 1024
+
+
+def make_block(density, seed=0):
+    """Create a block of text where each needle makes up roughly `density` of the words."""
+
+    rand = random.Random(seed)
+    vocabulary = [
+        ''.join(rand.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rand.randint(2, 10))) for _ in range(500)
+    ]
+    lines = []
+    size = 0
+    while size < BLOCK_SIZE:
+        words = []
+        for _ in range(10):
+            if rand.random() < density * len(NEEDLES):
+                words.append(rand.choice(NEEDLES))
+            else:
+                words.append(rand.choice(vocabulary))
+            words.append(rand.choice(' ' * 6 + '.(),'))
+        line = ''.join(words).rstrip() + '\n'
+        lines.append(line)
+        size += len(line)
+    return ''.join(lines)
+
+
+def make_text(size, density):
+    """Create a buffer of (about) the given size by repeating a block."""
+
+    block = make_block(density)
+    return block * (size // len(block)) + block[:block.rfind('\n', 0, size % len(block)) + 1]
+
+
+def make_rare_text(size, seed=0):
+    """Create a buffer of random words where the needles only show up on the first line."""
+
+    rand = random.Random(seed)
+    vocabulary = set()
+    while len(vocabulary) < 5000:
+        vocabulary.add(''.join(rand.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rand.randint(2, 10))))
+    vocabulary = sorted(vocabulary - set(NEEDLES))
+    lines = ['start %s end\n' % ' '.join(NEEDLES)]
+    length = len(lines[0])
+    while length < size:
+        line = ' '.join(rand.choice(vocabulary) for _ in range(12)) + '\n'
+        lines.append(line)
+        length += len(line)
+    return ''.join(lines)
+
+
+def make_pins(count):
+    """Create the pinned words: the needles, and made up codes that may or may not be in the text."""
+
+    return {word: 'string' if i % 2 else 'keyword' for i, word in enumerate(
+        NEEDLES + tuple('err%04d' % i for i in range(count - len(NEEDLES)))
+    )}
+
+
+def make_scopes(text):
+    """Mark every fourth line as a comment."""
+
+    scopes = []
+    begin = 0
+    row = 0
+    while begin < len(text):
+        end = text.find('\n', begin) + 1 or len(text)
+        if row % 4 == 0:
+            scopes.append((fake_sublime.Region(begin, end), 'comment.line'))
+        begin = end
+        row += 1
+    return scopes
+
+
+def setup(text, selections, options=None, scopes=()):
+    """Create a view with the cursor(s) on the needle(s) near the top of the buffer."""
+
+    fake_sublime.reset()
+    settings = fake_sublime.load_settings('highlight_word.sublime-settings')
+    settings.set('highlight_scopes', ['string', 'keyword', 'constant.language'])
+    settings.set('require_word_select', False)
+    settings.set('select_max_matches', -1)
+    settings.set('result_cache_budget', 0)
+    settings.set('region_budget', -1)
+    for key, value in (options or {}).items():
+        settings.set(key, value)
+    highlight_word.set_reload()
+    highlight_word.highlight_word = highlight_word.HighlightWord()
+    # Search on the calling thread so the whole search is timed.
+    highlight_word.executor = None
+    highlight_word.hw_thread = None
+
+    view = fake_sublime.active_window().new_view(text, settings={'word_separators': SEPARATORS})
+    view.set_scopes(scopes)
+    for needle in NEEDLES[:selections]:
+        pt = text.find(' %s ' % needle)
+        view.sel().add(pt + 1)
+    return view
+
+
+def outcome(view):
+    """Count what a case did: the regions drawn, the selections, and the matches counted in the whole file."""
+
+    counts = highlight_word.match_counts.get(view.buffer_id())
+    return {
+        'regions': sum(len(regions) for regions in view.regions.values()),
+        'selected': len(view.sel()),
+        'counted': sum(counts[1].values()) if counts is not None else 0
+    }
+
+
+def measure(view, func):
+    """Time a function and count the API calls it makes."""
+
+    view.calls = {}
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    return elapsed, dict(view.calls)
+
+
+def run_search(view):
+    """Full search of the visible region."""
+
+    highlight_word.highlight_word.do_search(view, True)
+
+
+def run_scroll(view):
+    """Scroll a few lines and update."""
+
+    view.scroll_to_line(5)
+    highlight_word.highlight_word.do_search(view, False)
+    view.scroll_to_line(0)
+    highlight_word.highlight_word.do_search(view, False)
+
+
+def run_select(view):
+    """Select all instances of the selected words."""
+
+    highlight_word.HighlightWordSelectCommand(view).run(None)
+    job = highlight_word.select_jobs.get(view.id())
+    if job is not None:
+        job.join()
+    fake_sublime.main_loop.idle()
+
+
+def cases(sizes, rare_sizes):
+    """Generate the benchmark cases."""
+
+    for size_name, size in sizes:
+        for density_name, density in DENSITIES:
+            text = make_text(size, density)
+            scopes = make_scopes(text)
+            for selections in SELECTIONS:
+                for scenario, func, setup_search, options in (
+                    ('search', run_search, False, None),
+                    ('scroll', run_scroll, True, None),
+                    ('select', run_select, False, None),
+                    ('pinned', run_search, False, {'pinned_words': make_pins(PINS)}),
+                    ('scoped', run_search, False, {'ignore_scopes': 'comment, string'}),
+                    ('counted', run_search, False, {'show_match_count': True})
+                ):
+                    name = '%s/%s/%s/%dsel' % (scenario, size_name, density_name, selections)
+                    yield name, text, selections, func, setup_search, options, scopes
+
+    # Scans that run to the end of the buffer after the last match.
+    for size_name, size in rare_sizes:
+        text = make_rare_text(size)
+        for selections in SELECTIONS:
+            for scenario, func, options in (
+                ('select', run_select, None),
+                ('counted', run_search, {'show_match_count': True})
+            ):
+                name = '%s/%s/rare/%dsel' % (scenario, size_name, selections)
+                yield name, text, selections, func, False, options, ()
+
+
+def run(sizes, rare_sizes, repeat):
+    """Run all the cases and return the results."""
+
+    results = {}
+    for name, text, selections, func, setup_search, options, scopes in cases(sizes, rare_sizes):
+        best = None
+        calls = None
+        for _ in range(repeat):
+            view = setup(text, selections, options, scopes)
+            if setup_search:
+                run_search(view)
+            elapsed, calls = measure(view, lambda: func(view))
+            best = elapsed if best is None else min(best, elapsed)
+        found = outcome(view)
+        results[name] = {'seconds': best, 'calls': calls, 'results': found}
+        print(
+            '%-32s %10.3f ms  %s  [%s]' % (
+                name, best * 1000,
+                ' '.join('%s=%d' % c for c in sorted(calls.items())),
+                ' '.join('%s=%d' % r for r in sorted(found.items()))
+            )
+        )
+    return results
+
+
+def compare(results, baselines, tolerance):
+    """Compare results against the baselines and return a list of regressions."""
+
+    regressions = []
+    for name, result in sorted(results.items()):
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        if 'results' not in baseline:
+            regressions.append('%s: the baseline has no results, run with --update' % name)
+        for key, count in sorted(result['results'].items()):
+            expected = baseline.get('results', {}).get(key)
+            if expected is not None and count != expected:
+                regressions.append('%s: %d %s, baseline is %d' % (name, count, key, expected))
+        for api, count in sorted(result['calls'].items()):
+            expected = baseline['calls'].get(api, 0)
+            if count > expected:
+                regressions.append('%s: %d calls to %s, baseline is %d' % (name, count, api, expected))
+        limit = baseline['seconds'] * tolerance + 0.002
+        if result['seconds'] > limit:
+            regressions.append(
+                '%s: took %.3f ms, baseline is %.3f ms' % (name, result['seconds'] * 1000, baseline['seconds'] * 1000)
+            )
+    return regressions
+
+
+def main(argv=None):
+    """Run the suite."""
+
+    parser = argparse.ArgumentParser(prog='bench_highlight_word_suite', description='HighlightWord benchmark suite.')
+    parser.add_argument('--full', action='store_true', help='Include the 100 MB buffers.')
+    parser.add_argument('--update', action='store_true', help='Store the results as the new baselines.')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case (the fastest is kept).')
+    parser.add_argument(
+        '--tolerance', type=float, default=2.0, help='Allowed slowdown factor relative to the baseline.'
+    )
+    args = parser.parse_args(argv)
+
+    results = run(FULL_SIZES if args.full else SIZES, FULL_RARE_SIZES if args.full else RARE_SIZES, args.repeat)
+
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+
+    if args.update:
+        baselines.update(results)
+        with open(BASELINES, 'w') as f:
+            json.dump(baselines, f, indent=4, sort_keys=True)
+            f.write('\n')
+        print('Baselines updated.')
+        return 0
+
+    regressions = compare(results, baselines, args.tolerance)
+    if regressions:
+        print('\nREGRESSIONS:')
+        for regression in regressions:
+            print('  ' + regression)
+        return 1
+    print('\nNo regressions.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
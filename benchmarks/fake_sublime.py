@@ -0,0 +1,772 @@
+"""
+In-memory stand-in for the parts of the Sublime Text API used by the plugins.
+
+Call `install()` before importing a plugin module so that `import sublime` and
+`import sublime_plugin` resolve to this module and a matching stub.  Callbacks
+scheduled with `set_timeout` run in order on a single "main" thread to mimic
+Sublime's UI thread.
+"""
+import bisect
+import heapq
+import itertools
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import types
+
+LITERAL = 1
+IGNORECASE = 2
+
+DRAW_EMPTY = 1
+HIDE_ON_MINIMAP = 2
+DRAW_EMPTY_AS_OVERWRITE = 4
+DRAW_NO_FILL = 32
+DRAW_NO_OUTLINE = 256
+DRAW_SOLID_UNDERLINE = 512
+DRAW_STIPPLED_UNDERLINE = 1024
+DRAW_SQUIGGLY_UNDERLINE = 2048
+PERSISTENT = 16
+HIDDEN = 128
+
+HOVER_TEXT = 1
+HOVER_GUTTER = 2
+HOVER_MARGIN = 3
+
+callbacks = {'set_timeout': 0, 'set_timeout_async': 0}
+
+
+def counted(func):
+    """Count calls to a `View` API method in the view's `calls`."""
+
+    name = func.__name__
+
+    def wrapper(self, *args, **kwargs):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        return func(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+class Region(object):
+    """Region."""
+
+    __slots__ = ('a', 'b', 'xpos')
+
+    def __init__(self, a, b=None, xpos=-1):
+        """Initialize."""
+
+        if b is None:
+            b = a
+        self.a = a
+        self.b = b
+        self.xpos = xpos
+
+    def __len__(self):
+        """Size of region."""
+
+        return self.size()
+
+    def __eq__(self, other):
+        """Equality."""
+
+        return isinstance(other, Region) and self.a == other.a and self.b == other.b
+
+    def __ne__(self, other):
+        """Inequality."""
+
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        """Hash."""
+
+        return hash((self.a, self.b))
+
+    def __repr__(self):
+        """Representation."""
+
+        return '(%d, %d)' % (self.a, self.b)
+
+    def begin(self):
+        """Beginning of region."""
+
+        return min(self.a, self.b)
+
+    def end(self):
+        """End of region."""
+
+        return max(self.a, self.b)
+
+    def size(self):
+        """Size of region."""
+
+        return abs(self.b - self.a)
+
+    def empty(self):
+        """Region is empty."""
+
+        return self.a == self.b
+
+    def contains(self, x):
+        """Region contains a point or region."""
+
+        if isinstance(x, Region):
+            return self.contains(x.a) and self.contains(x.b)
+        return self.begin() <= x <= self.end()
+
+    def intersects(self, rhs):
+        """Regions intersect."""
+
+        lb = self.begin()
+        le = self.end()
+        rb = rhs.begin()
+        re_ = rhs.end()
+        return (
+            (lb == rb and le == re_) or
+            (rb > lb and rb < le) or (re_ > lb and re_ < le) or
+            (lb > rb and lb < re_) or (le > rb and le < re_)
+        )
+
+    def intersection(self, rhs):
+        """Intersection of regions."""
+
+        if self.end() <= rhs.begin() or rhs.end() <= self.begin():
+            return Region(0)
+        return Region(max(self.begin(), rhs.begin()), min(self.end(), rhs.end()))
+
+    def cover(self, rhs):
+        """Cover both regions."""
+
+        return Region(min(self.begin(), rhs.begin()), max(self.end(), rhs.end()))
+
+
+class Settings(object):
+    """Settings object."""
+
+    def __init__(self, values=None):
+        """Initialize."""
+
+        self.values = dict(values) if values else {}
+        self.listeners = {}
+
+    def get(self, key, default=None):
+        """Get setting."""
+
+        return self.values.get(key, default)
+
+    def set(self, key, value):  # noqa: A003
+        """Set setting."""
+
+        self.values[key] = value
+        for callback in list(self.listeners.values()):
+            callback()
+
+    def has(self, key):
+        """Check for setting."""
+
+        return key in self.values
+
+    def erase(self, key):
+        """Erase setting."""
+
+        self.values.pop(key, None)
+
+    def add_on_change(self, tag, callback):
+        """Add change listener."""
+
+        self.listeners[tag] = callback
+
+    def clear_on_change(self, tag):
+        """Clear change listener."""
+
+        self.listeners.pop(tag, None)
+
+
+class Selection(object):
+    """View selection."""
+
+    def __init__(self):
+        """Initialize."""
+
+        self.regions = []
+
+    def __len__(self):
+        """Number of selections."""
+
+        return len(self.regions)
+
+    def __iter__(self):
+        """Iterate selections."""
+
+        return iter(list(self.regions))
+
+    def __getitem__(self, index):
+        """Get selection."""
+
+        return self.regions[index]
+
+    def clear(self):
+        """Clear selections."""
+
+        self.regions = []
+
+    def add(self, region):
+        """Add selection."""
+
+        if not isinstance(region, Region):
+            region = Region(region)
+        self.regions.append(region)
+        self.regions.sort(key=lambda r: r.begin())
+
+    def add_all(self, regions):
+        """Add all selections."""
+
+        for region in regions:
+            if not isinstance(region, Region):
+                region = Region(region)
+            self.regions.append(region)
+        self.regions.sort(key=lambda r: r.begin())
+
+
+class View(object):
+    """In-memory view."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, text='', window=None, settings=None, lines=60):
+        """Initialize."""
+
+        self.view_id = next(self._ids)
+        self.text = text
+        self._window = window
+        self._settings = Settings(settings)
+        self._sel = Selection()
+        self._change_count = 0
+        self.regions = {}
+        self.status = {}
+        self.viewport = 0
+        self.lines = lines
+        self.region_log = []
+        self._name = ''
+        self.calls = {}
+        self.scopes = []
+        self.scope_begins = []
+
+    def id(self):  # noqa: A003
+        """View id."""
+
+        return self.view_id
+
+    def buffer_id(self):
+        """Buffer id."""
+
+        return self.view_id
+
+    def is_valid(self):
+        """View is valid."""
+
+        return True
+
+    def window(self):
+        """Get window."""
+
+        return self._window
+
+    @counted
+    def settings(self):
+        """Get settings."""
+
+        return self._settings
+
+    @counted
+    def sel(self):
+        """Get selection."""
+
+        return self._sel
+
+    @counted
+    def size(self):
+        """Buffer size."""
+
+        return len(self.text)
+
+    @counted
+    def change_count(self):
+        """Change count."""
+
+        return self._change_count
+
+    def set_text(self, text):
+        """Replace the whole buffer."""
+
+        self.text = text
+        self._change_count += 1
+
+    def insert(self, edit, pt, text):
+        """Insert text."""
+
+        self.set_text(self.text[:pt] + text + self.text[pt:])
+        return len(text)
+
+    def replace(self, edit, region, text):
+        """Replace text."""
+
+        self.set_text(self.text[:region.begin()] + text + self.text[region.end():])
+
+    def set_read_only(self, value):
+        """Set read only."""
+
+    def set_scratch(self, value):
+        """Set scratch."""
+
+    def set_encoding(self, encoding):
+        """Set encoding."""
+
+    def set_syntax_file(self, syntax):
+        """Set syntax."""
+
+    @counted
+    def substr(self, x):
+        """Get text."""
+
+        if isinstance(x, Region):
+            return self.text[x.begin():x.end()]
+        return self.text[x:x + 1]
+
+    @counted
+    def find(self, pattern, start_pt, flags=0):
+        """Find pattern."""
+
+        if flags & LITERAL:
+            if flags & IGNORECASE:
+                m = re.compile(re.escape(pattern), re.I).search(self.text, start_pt)
+                return Region(m.start(), m.end()) if m else Region(-1, -1)
+            index = self.text.find(pattern, start_pt)
+            return Region(index, index + len(pattern)) if index != -1 else Region(-1, -1)
+        m = re.compile(pattern, re.I if flags & IGNORECASE else 0).search(self.text, start_pt)
+        return Region(m.start(), m.end()) if m else Region(-1, -1)
+
+    def set_scopes(self, scopes):
+        """Set the `(region, scope)` runs that stand in for syntax highlighting (sorted, not overlapping)."""
+
+        self.scopes = list(scopes)
+        self.scope_begins = [r.begin() for r, scope in self.scopes]
+
+    @counted
+    def find_by_selector(self, selector):
+        """Find by selector (only a comma separated list of scope prefixes is supported)."""
+
+        prefixes = tuple(s.strip() for s in selector.split(',') if s.strip())
+        return [Region(r.begin(), r.end()) for r, scope in self.scopes if scope.startswith(prefixes)]
+
+    @counted
+    def extract_tokens_with_scopes(self, region):
+        """Get the `(region, scope)` tokens covering the region."""
+
+        tokens = []
+        pt = region.begin()
+        i = max(0, bisect.bisect_right(self.scope_begins, pt) - 1)
+        for r, scope in self.scopes[i:]:
+            if r.begin() >= region.end():
+                break
+            if r.end() <= pt:
+                continue
+            if r.begin() > pt:
+                tokens.append((Region(pt, r.begin()), 'text.plain '))
+            tokens.append((Region(max(pt, r.begin()), r.end()), 'text.plain %s ' % scope))
+            pt = r.end()
+        if pt < region.end():
+            tokens.append((Region(pt, region.end()), 'text.plain '))
+        return tokens
+
+    @counted
+    def scope_name(self, pt):
+        """Scope name."""
+
+        for r, scope in self.scopes:
+            if r.begin() <= pt < r.end():
+                return 'text.plain %s ' % scope
+        return 'text.plain '
+
+    @counted
+    def word(self, x):
+        """Expand to word."""
+
+        separators = self._settings.get('word_separators', '') + ' \n\r\t'
+        if isinstance(x, Region):
+            begin = x.begin()
+            end = x.end()
+        else:
+            begin = end = x
+        while begin > 0 and self.text[begin - 1] not in separators:
+            begin -= 1
+        while end < len(self.text) and self.text[end] not in separators:
+            end += 1
+        return Region(begin, end)
+
+    @counted
+    def line(self, x):
+        """Expand to line."""
+
+        pt = x.begin() if isinstance(x, Region) else x
+        begin = self.text.rfind('\n', 0, pt) + 1
+        end = self.text.find('\n', pt)
+        return Region(begin, len(self.text) if end == -1 else end)
+
+    @counted
+    def text_point(self, row, col):
+        """Get point from row and column."""
+
+        return self._text_point(row, col)
+
+    def _text_point(self, row, col):
+        """Get point from row and column (without counting it as an API call)."""
+
+        pt = 0
+        for _ in range(row):
+            index = self.text.find('\n', pt)
+            if index == -1:
+                return len(self.text)
+            pt = index + 1
+        return pt + col
+
+    def scroll_to_line(self, row):
+        """Move the viewport so `row` is the first visible line."""
+
+        self.viewport = self._text_point(row, 0)
+
+    @counted
+    def visible_region(self):
+        """Get the visible region."""
+
+        begin = self.viewport
+        end = begin
+        for _ in range(self.lines):
+            index = self.text.find('\n', end)
+            if index == -1:
+                end = len(self.text)
+                break
+            end = index + 1
+        return Region(begin, end)
+
+    @counted
+    def add_regions(self, key, regions, scope='', icon='', flags=0):
+        """Add regions."""
+
+        self.regions[key] = list(regions)
+        self.region_log.append((time.time(), key, len(self.regions[key])))
+
+    @counted
+    def get_regions(self, key):
+        """Get regions."""
+
+        return list(self.regions.get(key, []))
+
+    @counted
+    def erase_regions(self, key):
+        """Erase regions."""
+
+        self.regions.pop(key, None)
+
+    @counted
+    def set_status(self, key, value):
+        """Set status."""
+
+        self.status[key] = value
+
+    @counted
+    def erase_status(self, key):
+        """Erase status."""
+
+        self.status.pop(key, None)
+
+    def show(self, x, show_surrounds=True):
+        """Show region."""
+
+    def show_at_center(self, x):
+        """Show region at center."""
+
+    def set_viewport_position(self, xy, animate=True):
+        """Set viewport position."""
+
+        self.viewport = 0
+
+    def file_name(self):
+        """File name."""
+
+        return None
+
+    def name(self):
+        """View name."""
+
+        return self._name
+
+    def set_name(self, name):
+        """Set view name."""
+
+        self._name = name
+
+    def is_loading(self):
+        """View is loading."""
+
+        return False
+
+    def run_command(self, cmd, args=None):
+        """Run command."""
+
+
+class Window(object):
+    """In-memory window."""
+
+    def __init__(self):
+        """Initialize."""
+
+        self._views = []
+        self.active = None
+        self.groups = 1
+
+    def id(self):  # noqa: A003
+        """Window id."""
+
+        return 1
+
+    def new_view(self, text='', **kwargs):
+        """Create and focus a view."""
+
+        view = View(text, window=self, **kwargs)
+        self._views.append(view)
+        self.active = view
+        return view
+
+    def views(self):
+        """Get views."""
+
+        return list(self._views)
+
+    def active_view(self):
+        """Get active view."""
+
+        return self.active
+
+    def num_groups(self):
+        """Number of groups."""
+
+        return self.groups
+
+    def active_view_in_group(self, group):
+        """Active view in group."""
+
+        if group < len(self._views):
+            return self._views[group]
+        return None
+
+    def focus_view(self, view):
+        """Focus view."""
+
+        self.active = view
+
+    def status_message(self, msg):
+        """Status message."""
+
+    def show_quick_panel(self, items, on_select, flags=0, selected_index=-1, on_highlight=None):
+        """Show quick panel (the items are kept for inspection)."""
+
+        self.quick_panel = items
+
+    def run_command(self, cmd, args=None):
+        """Run command."""
+
+
+class MainLoop(threading.Thread):
+    """Run scheduled callbacks in order, like Sublime's main thread."""
+
+    def __init__(self):
+        """Initialize."""
+
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.condition = threading.Condition()
+        self.queue = []
+        self.counter = itertools.count()
+        self.running = False
+
+    def push(self, callback, delay):
+        """Schedule a callback."""
+
+        with self.condition:
+            heapq.heappush(self.queue, (time.time() + delay / 1000.0, next(self.counter), callback))
+            self.condition.notify()
+
+    def idle(self, timeout=5.0):
+        """Wait until there is nothing left to run (including the callback being run)."""
+
+        end = time.time() + timeout
+        while time.time() < end:
+            with self.condition:
+                if not self.queue and not self.running:
+                    return True
+            time.sleep(0.001)
+        return False
+
+    def run(self):
+        """Run callbacks as they come due."""
+
+        while True:
+            with self.condition:
+                while not self.queue or self.queue[0][0] > time.time():
+                    self.condition.wait(self.queue[0][0] - time.time() if self.queue else None)
+                callback = heapq.heappop(self.queue)[2]
+                self.running = True
+            try:
+                callback()
+            finally:
+                with self.condition:
+                    self.running = False
+
+
+main_loop = MainLoop()
+_window = Window()
+_settings = {}
+
+
+def set_timeout(callback, delay=0):
+    """Run callback on the main thread."""
+
+    callbacks['set_timeout'] += 1
+    main_loop.push(callback, delay)
+
+
+def set_timeout_async(callback, delay=0):
+    """Run callback on the async thread (shared with the main thread here)."""
+
+    callbacks['set_timeout_async'] += 1
+    main_loop.push(callback, delay)
+
+
+def run_main(callback):
+    """Run a callback on the main thread and wait for it to finish."""
+
+    done = threading.Event()
+    result = []
+
+    def wrapper():
+        try:
+            result.append(callback())
+        finally:
+            done.set()
+
+    main_loop.push(wrapper, 0)
+    done.wait()
+    return result[0]
+
+
+def active_window():
+    """Active window."""
+
+    return _window
+
+
+def windows():
+    """All windows."""
+
+    return [_window]
+
+
+def load_settings(name):
+    """Load settings."""
+
+    if name not in _settings:
+        _settings[name] = Settings()
+    return _settings[name]
+
+
+def save_settings(name):
+    """Save settings."""
+
+
+def cache_path():
+    """Cache path."""
+
+    return os.path.join(tempfile.gettempdir(), 'fake_sublime_cache')
+
+
+def score_selector(scope, selector):
+    """Score a scope against a selector (only a comma separated list of scope prefixes is supported)."""
+
+    names = scope.split()
+    for part in selector.split(','):
+        part = part.strip()
+        if part and any(name.startswith(part) for name in names):
+            return len(part.split('.'))
+    return 0
+
+
+def status_message(msg):
+    """Status message."""
+
+
+def version():
+    """Sublime version."""
+
+    return '3211'
+
+
+def reset():
+    """Reset global state between benchmarks."""
+
+    global _window
+    _window = Window()
+    _settings.clear()
+    for key in callbacks:
+        callbacks[key] = 0
+
+
+def install():
+    """Register the fake `sublime` and `sublime_plugin` modules."""
+
+    plugin = types.ModuleType('sublime_plugin')
+
+    class EventListener(object):
+        """Event listener."""
+
+    class ViewEventListener(object):
+        """View event listener."""
+
+        def __init__(self, view):
+            """Initialize."""
+
+            self.view = view
+
+    class TextCommand(object):
+        """Text command."""
+
+        def __init__(self, view):
+            """Initialize."""
+
+            self.view = view
+
+    class WindowCommand(object):
+        """Window command."""
+
+        def __init__(self, window):
+            """Initialize."""
+
+            self.window = window
+
+    class ApplicationCommand(object):
+        """Application command."""
+
+    plugin.EventListener = EventListener
+    plugin.ViewEventListener = ViewEventListener
+    plugin.TextCommand = TextCommand
+    plugin.WindowCommand = WindowCommand
+    plugin.ApplicationCommand = ApplicationCommand
+
+    sys.modules['sublime'] = sys.modules[__name__]
+    sys.modules['sublime_plugin'] = plugin
+    if not main_loop.is_alive():
+        main_loop.start()
@@ -19,6 +19,15 @@ When doing multiple cursors, you can highlight each in their own color
     "highlight_scopes": ["string", "keyword", "constant.language"],
 ```
 
+The selected words can also be highlighted in the other visible views of the window, such as the other panes of a split
+layout. Each view is searched in parallel, and its highlights are kept separate from the others:
+
+```
+    // Also highlight the selected words in the other visible views of the window
+    // (for instance, the other panes of a split layout).
+    "highlight_visible_views": false,
+```
+
 Style of highlights can also be controlled:
 
 ```
@@ -26,22 +35,86 @@ Style of highlights can also be controlled:
     "highlight_style": "outline",
 ```
 
-Optionally can disable highlight if number of selections in view are greater than a certain value:
+Very common words can produce a huge number of highlights. A budget limits how many regions a single word can
+produce, and a policy decides what happens when a word goes over it:
+
+```
+    // Maximum number of regions to draw for a single highlighted word.
+    // -1 means no limit.
+    "region_budget": 5000,
+
+    // What to do when a word has more matches than "region_budget" allows:
+    //   viewport: only highlight the matches that are in view
+    //   cheap: highlight all matches, but with a thin underline, which is cheaper to draw
+    //   skip: don't highlight the word, and show a message in the status bar
+    "region_budget_policy": "viewport",
+```
+
+With many cursors, only the first selections can be looked at, and you can control what happens when there are more
+distinct words than highlight scopes:
 
 ```
-    // If selection threshold is greater than
-    // the specified setting, don't highlight words.
+    // Only look at the first N selections when finding the words to highlight,
+    // so a huge number of cursors doesn't stall the editor.
     // -1 means no threshold.
-    "selection_threshold": -1
+    "selection_threshold": -1,
+
+    // What to do when the selections contain more distinct words than there are
+    // highlight scopes:
+    //   first: highlight the first words found
+    //   none: don't highlight anything
+    "selection_overflow": "first",
+```
+
+On large files, an index of word occurrences can be kept for each view so that highlighting and selecting just look up
+the matches instead of scanning the text. The index is built in the background and is updated from edits as they happen
+(on Sublime Text 4; older versions re-index in the background when editing pauses):
+
+```
+    // Keep an index of word occurrences for each view, so highlighting and selecting
+    // just look up the matches instead of scanning the text. The index is built in the
+    // background and is updated from edits as they happen (on Sublime Text 4; older
+    // versions re-index in the background when editing pauses).
+    "use_word_index": false
 ```
 """
 import sublime
 import sublime_plugin
-from time import time, sleep
+from time import time, perf_counter
 import threading
+import functools
+import re
+import bisect
+import itertools
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 KEY = "HighlightCurrentWord"
+PIN_KEY = "HighlightWordPinned"
 SCOPE = 'comment'
+INDEX_CHUNK_SIZE = 8192
+INDEX_REBUILD_DELAY = 1000
+SELECT_CHUNK_SIZE = 1024 * 1024
+WORKERS = 4
+# Selections are expanded to words in batches that span at most this many characters,
+# with this much extra text read on either side for words that start or end outside the batch.
+WORD_BATCH_SIZE = 65536
+WORD_MARGIN = 256
+STATS_SAMPLES = 1000
+# The debounce delay is a multiple of what searching the view has recently cost (within the configured bounds).
+# A costlier search raises the estimate at once, while a cheaper one only pulls it down gradually.
+DEBOUNCE_FACTOR = 2.0
+DEBOUNCE_DECAY = 0.25
+DEBOUNCE_DEFAULT = 0.12
+# The viewport is polled at a multiple of the debounce delay, within these bounds (in seconds).
+POLL_FACTOR = 4.0
+POLL_MIN = 0.25
+POLL_MAX = 2.0
+# Rough memory cost of a cached region and of a cache entry (in bytes)
+CACHE_REGION_COST = 120
+CACHE_ENTRY_COST = 1024
+SELECT_STATUS = "highlight_word_select"
+COUNT_STATUS = "highlight_word_count"
 
 reload_flag = False
 highlight_word = None
@@ -50,6 +123,17 @@ settings = None
 if 'hw_thread' not in globals():
     hw_thread = None
 
+if 'executor' not in globals():
+    executor = None
+
+word_indexes = {}
+select_jobs = {}
+generations = {}
+scope_runs = {}
+match_counts = {}
+drawn = {}
+written = {}
+
 
 def debug(s):
     """Debug logging."""
@@ -57,6 +141,102 @@ def debug(s):
     print("HighlightWord: " + s)
 
 
+class Stats(object):
+    """
+    Counters and timings for the hot paths, per view.
+
+    Callers check `enabled` before recording anything, so this costs next to nothing when disabled.
+    Timings keep the most recent samples only.
+    """
+
+    def __init__(self):
+        """Setup."""
+
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        """Clear everything recorded so far."""
+
+        self.counters = {}
+        self.timings = {}
+        self.names = {}
+
+    def key(self, view):
+        """Key to record the view's stats under."""
+
+        if view is None:
+            return 0
+        view_id = view.id()
+        if view_id not in self.names:
+            self.names[view_id] = view.file_name() or view.name() or 'untitled'
+        return view_id
+
+    def count(self, view, name, amount=1):
+        """Increment a counter."""
+
+        counters = self.counters.setdefault(self.key(view), {})
+        counters[name] = counters.get(name, 0) + amount
+
+    def time(self, view, name, seconds):  # noqa: A003
+        """Record a timing."""
+
+        timings = self.timings.setdefault(self.key(view), {})
+        if name not in timings:
+            timings[name] = deque(maxlen=STATS_SAMPLES)
+        timings[name].append(seconds)
+
+    @staticmethod
+    def percentile(samples, percent):
+        """Get the percentile of sorted samples (nearest rank)."""
+
+        return samples[max(0, min(len(samples) - 1, int(round(percent / 100.0 * len(samples))) - 1))]
+
+    def report(self):
+        """Format everything recorded so far."""
+
+        lines = ['HighlightWord Stats']
+        for key in sorted(set(self.counters) | set(self.timings)):
+            lines.append('  %s:' % ('global' if key == 0 else 'view %d (%s)' % (key, self.names.get(key, ''))))
+            for name, samples in sorted(self.timings.get(key, {}).items()):
+                samples = sorted(samples)
+                lines.append(
+                    '    %-16s n=%-6d p50=%8.3fms  p95=%8.3fms  p99=%8.3fms' % (
+                        name,
+                        len(samples),
+                        self.percentile(samples, 50) * 1000,
+                        self.percentile(samples, 95) * 1000,
+                        self.percentile(samples, 99) * 1000
+                    )
+                )
+            for name, count in sorted(self.counters.get(key, {}).items()):
+                lines.append('    %-16s %d' % (name, count))
+        if len(lines) == 1:
+            lines.append('  Nothing recorded (is "enable_stats" on?)')
+        return '\n'.join(lines)
+
+
+stats = Stats()
+
+
+def timed(name):
+    """Record how long a method takes for the view it was called for, if stats are enabled."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not stats.enabled:
+                return func(self, *args, **kwargs)
+            view = self.view if isinstance(self, sublime_plugin.TextCommand) else args[0]
+            start = perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                stats.time(view, name, perf_counter() - start)
+        return wrapper
+    return decorator
+
+
 def highlight_style(option):
     """Configure style of region based on option."""
 
@@ -82,6 +262,64 @@ def highlight_style(option):
     return style
 
 
+def set_view_setting(view, name, value):
+    """Set a view setting, unless it is already known to have the value."""
+
+    values = written.setdefault(view.id(), {})
+    if values.get(name) != value:
+        values[name] = value
+        view.settings().set(name, value)
+
+
+def draw_regions(view, key, regions, scope, flags):
+    """
+    Draw the regions under the key, unless the view already shows exactly these.
+
+    Adding the same regions again (or erasing and adding them) still makes Sublime redraw,
+    so the regions last drawn under each key are remembered for each view. An edit moves
+    (or collapses) the drawn regions, so they are only trusted for the buffer version they were drawn in.
+    """
+
+    if not regions:
+        erase_regions(view, key)
+        return
+    state = drawn.setdefault(view.id(), {})
+    current = (regions, scope, flags, view.change_count())
+    if state.get(key) == current:
+        if stats.enabled:
+            stats.count(view, 'redraws skipped')
+        return
+    state[key] = current
+    view.add_regions(key, regions, scope, "", flags)
+
+
+def erase_regions(view, key):
+    """Erase the regions under the key, if any were drawn."""
+
+    state = drawn.get(view.id())
+    if state is not None and state.pop(key, None) is not None:
+        view.erase_regions(key)
+
+
+def clear_keys(view, prefix, setting):
+    """
+    Erase the regions under all of the keys starting with the prefix.
+
+    If nothing is known about what was drawn in the view (for instance, after the plugin is reloaded),
+    the number of keys is read from the view setting.
+    """
+
+    values = written.setdefault(view.id(), {})
+    if setting not in values:
+        values[setting] = view.settings().get(setting, 0)
+        for count in range(0, values[setting]):
+            view.erase_regions(prefix + str(count))
+    else:
+        for key in [k for k in drawn.get(view.id(), {}) if k.startswith(prefix)]:
+            erase_regions(view, key)
+    set_view_setting(view, setting, 0)
+
+
 def clear_regions(view=None):
     """Clear regions."""
 
@@ -89,31 +327,657 @@ def clear_regions(view=None):
         win = sublime.active_window()
         if win is not None:
             view = win.active_view()
-    if view is not None:
-        regions = view.settings().get('highlight_word.regions', 0)
-        if highlight_word is not None:
-            for count in range(0, regions):
-                view.erase_regions(KEY + str(count))
-                view.settings().set('highlight_word.regions', 0)
+    if view is not None and highlight_word is not None:
+        clear_keys(view, KEY, 'highlight_word.regions')
+
+
+def clear_pinned(view):
+    """Clear the pinned word regions."""
 
+    clear_keys(view, PIN_KEY, 'highlight_word.pinned_regions')
 
-def underline(regions):
-    """Convert to empty regions."""
 
-    new_regions = []
+def underline(regions, visible_region):
+    """
+    Convert to empty regions.
+
+    Regions are expanded lazily, and only the part within the visible region is expanded.
+    """
+
+    begin = visible_region.begin()
+    end = visible_region.end()
     for region in regions:
-        start = region.begin()
-        end = region.end()
-        while start < end:
-            new_regions.append(sublime.Region(start))
+        start = max(begin, region.begin())
+        stop = min(end, region.end())
+        while start < stop:
+            yield sublime.Region(start)
             start += 1
-    return new_regions
 
 
-# The search is performed half a second after the most recent event
+@functools.lru_cache(maxsize=32)
+def compile_words(words, separators):
+    """
+    Compile a pattern that matches any of the words.
+
+    A match must be followed by a separator character or the end of the text. It must also be preceded by one
+    (or the start of the text), but that is left for the caller to check: a lookbehind at the start of the
+    pattern stops `re` from skipping ahead to the word, which makes scanning a large buffer several times slower.
+    """
+
+    boundary = re.escape(separators)
+    return re.compile(
+        r'(?:%s)(?![^%s])' % (
+            '|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True)),
+            boundary
+        )
+    )
+
+
+def find_words(text, offset, words, separators, begin, end):
+    """
+    Find all the words in a single pass over the text.
+
+    `text` is the buffer content starting at point `offset`. It should include one character
+    before `begin` and one after `end` (if the buffer has them) so that the word boundaries
+    can be checked. Only matches that fall within `begin` and `end` are returned.
+
+    A list of region lists is returned: one for each word in `words`, in the same order.
+    """
+
+    results = [[] for w in words]
+    if not words:
+        return results
+
+    lookup = {w: i for i, w in enumerate(words)}
+    # Stop the scan at `end`, or `re` would go on to the end of the text looking for the next match.
+    # The pattern takes `endpos` for the end of the text, so the separator after a match that ends
+    # there is checked here.
+    endpos = max(0, min(len(text), end - offset))
+    for m in compile_words(tuple(words), separators).finditer(text, max(0, begin - offset), endpos):
+        start, stop = m.span(0)
+        if start and text[start - 1] not in separators:
+            continue
+        if stop == endpos and stop < len(text) and text[stop] not in separators:
+            continue
+        results[lookup[m.group(0)]].append(sublime.Region(start + offset, stop + offset))
+    return results
+
+
+class Automaton(object):
+    """
+    Aho-Corasick automaton that finds any number of words in a single pass over the text.
+
+    The automaton is built once for a set of words (see `compile_pins`) and can then be shared by the workers.
+    """
+
+    def __init__(self, words):
+        """Build the trie, the failure links, and the output of each state."""
+
+        self.words = words
+        self.lengths = [len(w) for w in words]
+        goto = [{}]
+        out = [()]
+        for i, word in enumerate(words):
+            state = 0
+            for c in word:
+                nxt = goto[state].get(c)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][c] = nxt
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] += (i,)
+
+        # Breadth first, so the failure state (which is always shallower) is done before its dependents.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and c not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(c, 0)
+                out[nxt] += out[fail[nxt]]
+
+        self.goto = goto
+        self.fail = fail
+        self.out = out
+
+    def matches(self, text, start, stop):
+        """Yield `(end, word index)` for every occurrence of the words in `text[start:stop]`."""
+
+        goto = self.goto
+        fail = self.fail
+        out = self.out
+        state = 0
+        for pos in range(start, stop):
+            c = text[pos]
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            if out[state]:
+                for i in out[state]:
+                    yield pos + 1, i
+
+
+@functools.lru_cache(maxsize=4)
+def compile_pins(words):
+    """Build the automaton for a set of pinned words, so it is only rebuilt when the set changes."""
+
+    return Automaton(words)
+
+
+def find_pinned(text, offset, automaton, separators, begin, end):
+    """
+    Find all the pinned words in a single pass over the text.
+
+    `text`, `offset`, `begin`, and `end` are as in `find_words`. Like the selected words, a pinned word
+    must be bounded on each side by a separator character or the edge of the text. Where matches overlap,
+    the leftmost (and then the longest) wins.
+
+    A list of region lists is returned: one for each of the automaton's words, in the same order.
+    """
+
+    results = [[] for w in automaton.words]
+    lengths = automaton.lengths
+    size = len(text)
+    found = []
+    for stop, i in automaton.matches(text, max(0, begin - offset), min(size, end - offset)):
+        start = stop - lengths[i]
+        if (start > 0 and text[start - 1] not in separators) or (stop < size and text[stop] not in separators):
+            continue
+        found.append((start, -lengths[i], i))
+    found.sort()
+
+    last = 0
+    for start, length, i in found:
+        if start < last:
+            continue
+        last = start - length
+        results[i].append(sublime.Region(start + offset, last + offset))
+    return results
+
+
+@functools.lru_cache(maxsize=1024)
+def in_scope(scope, selector):
+    """Check if the scope name matches the selector."""
+
+    return sublime.score_selector(scope, selector) > 0
+
+
+def get_scope_runs(view, selector, begin, end):
+    """
+    Get the runs of text that match the scope selector, as sorted lists of where they begin and end.
+
+    Rather than checking the scope at each match, the scopes are queried in one batch: the tokens between
+    `begin` and `end` on Sublime Text 4, or the whole buffer on older versions. The runs are kept
+    until the buffer changes, so searching the same range again doesn't query anything.
+    """
+
+    buffer_id = view.buffer_id()
+    change_count = view.change_count()
+    cached = scope_runs.get(buffer_id)
+    if (
+        cached is not None and cached[0] == change_count and cached[1] == selector and
+        cached[2] <= begin and end <= cached[3]
+    ):
+        return cached[4]
+
+    begins = []
+    ends = []
+    if hasattr(view, 'extract_tokens_with_scopes'):
+        for region, scope in view.extract_tokens_with_scopes(sublime.Region(begin, end)):
+            if not in_scope(scope, selector):
+                continue
+            if ends and ends[-1] == region.begin():
+                ends[-1] = region.end()
+            else:
+                begins.append(region.begin())
+                ends.append(region.end())
+    else:
+        for region in sorted(view.find_by_selector(selector), key=lambda r: r.begin()):
+            begins.append(region.begin())
+            ends.append(region.end())
+        begin = 0
+        end = view.size()
+    if stats.enabled:
+        stats.count(view, 'scope queries')
+    runs = (begins, ends)
+    scope_runs[buffer_id] = (change_count, selector, begin, end, runs)
+    return runs
+
+
+def filter_scopes(regions, runs):
+    """Drop the regions that start within one of the scope runs."""
+
+    begins, ends = runs
+    if not begins:
+        return regions
+    kept = []
+    for region in regions:
+        pt = region.begin()
+        i = bisect.bisect_right(begins, pt) - 1
+        if i < 0 or pt >= ends[i]:
+            kept.append(region)
+    return kept
+
+
+def count_words(text, words, separators, is_stale):
+    """
+    Count all the occurrences of the words in the text, a chunk at a time.
+
+    Each word gets its own pass, as `re` can skip ahead to a single word much faster than to any of several.
+    Returns a dictionary of the counts, or `None` if `is_stale()` turned true before the count was done.
+    """
+
+    counts = {}
+    size = len(text)
+    for word in words:
+        pattern = compile_words((word,), separators)
+        count = 0
+        for begin in range(0, size, SELECT_CHUNK_SIZE):
+            if is_stale():
+                return None
+            # A word straddling the end of the chunk is counted in this chunk, and isn't counted again
+            # in the next, which starts in the middle of it. The scan stops right after such a word
+            # (rather than going on to the end of the text), so the separator after a match that ends
+            # there is checked here: the pattern takes `endpos` for the end of the text.
+            end = begin + SELECT_CHUNK_SIZE
+            endpos = min(size, end + len(word) - 1)
+            for m in pattern.finditer(text, begin, endpos):
+                start, stop = m.span()
+                if start >= end:
+                    break
+                if start and text[start - 1] not in separators:
+                    continue
+                if stop == endpos and stop < size and text[stop] not in separators:
+                    continue
+                count += 1
+        counts[word] = count
+    return counts
+
+
+def expand_words(view, batch, separators):
+    """
+    Expand a batch of selections to the words they are in.
+
+    The text around the whole batch is read once and the words are found in it, rather than
+    calling `view.word` and `view.substr` for each selection. Only a word that runs past the
+    text that was read falls back to the API.
+    """
+
+    size = view.size()
+    offset = max(0, batch[0].begin() - WORD_MARGIN)
+    stop = min(size, batch[-1].end() + WORD_MARGIN)
+    text = view.substr(sublime.Region(offset, stop))
+    if stats.enabled:
+        stats.count(view, 'substr calls')
+    last = len(text)
+    for selection in batch:
+        begin = selection.begin() - offset
+        end = selection.end() - offset
+        while begin > 0 and text[begin - 1] not in separators:
+            begin -= 1
+        while end < last and text[end] not in separators:
+            end += 1
+        if (begin == 0 and offset > 0) or (end == last and stop < size):
+            region = view.word(selection)
+            word = view.substr(region)
+            if stats.enabled:
+                stats.count(view, 'word calls')
+                stats.count(view, 'substr calls')
+        else:
+            region = sublime.Region(begin + offset, end + offset)
+            word = text[begin:end]
+        yield selection, region, word
+
+
+def iter_words(view, selections, separators):
+    """Yield `(selection, word region, word)` for each selection, reading the text a batch at a time."""
+
+    batch = []
+    for selection in selections:
+        # A selection this big can't be a single word.
+        if selection.size() > WORD_BATCH_SIZE:
+            continue
+        if batch and selection.end() - batch[0].begin() > WORD_BATCH_SIZE:
+            for item in expand_words(view, batch, separators):
+                yield item
+            batch = []
+        batch.append(selection)
+    if batch:
+        for item in expand_words(view, batch, separators):
+            yield item
+
+
+def get_words(view, separator_string, max_words, word_select=False, limit=-1, overflow='first'):
+    """
+    Get the distinct words that are selected (or that the cursors are in).
+
+    Only the first `limit` selections are looked at (-1 for all of them), and the search stops as soon
+    as it is known which words to use. If there are more than `max_words` distinct words, either the first
+    `max_words` are used (`overflow` is `first`) or none at all (`overflow` is `none`).
+
+    Returns a list of `(word, region)`.
+    """
+
+    separators = frozenset(separator_string)
+    selections = view.sel()
+    if limit >= 0:
+        selections = itertools.islice(selections, limit)
+
+    words = []
+    seen = set()
+    for selection, region, word in iter_words(view, selections, separators):
+        # See if a word is selected or if you are just in a word
+        if word_select and region.size() != selection.size():
+            continue
+
+        # remove leading/trailing separator characters just in case
+        word = word.strip(separator_string)
+        if not word or word in seen:
+            continue
+
+        # ignore the selection if it spans multiple words
+        if any(c in separators for c in word):
+            continue
+
+        if len(words) == max_words:
+            return [] if overflow == 'none' else words
+
+        seen.add(word)
+        words.append((word, region))
+        if len(words) == max_words and overflow != 'none':
+            break
+    return words
+
+
+class WordIndex(object):
+    """
+    Index of word occurrences in a buffer.
+
+    The buffer is split into chunks of whole lines. Each chunk maps the words it contains
+    to their sorted offsets from the start of the chunk. An edit only re-tokenizes the chunks
+    it touched and shifts the start of the chunks after it, and a lookup is a binary search
+    of the chunk starts followed by a binary search of each chunk's offsets.
+    """
+
+    def __init__(self, separators):
+        """Setup."""
+
+        self.separators = separators
+        self.pattern = re.compile(r'[^%s]+' % re.escape(separators))
+        self.starts = []
+        self.lengths = []
+        self.chunks = []
+        self.change_count = -1
+        self.lock = threading.Lock()
+
+    def tokenize(self, text, start):
+        """Split the text into chunks and return the chunk starts, lengths, and word maps."""
+
+        starts = []
+        lengths = []
+        chunks = []
+        pos = 0
+        size = len(text)
+        while pos < size:
+            cut = text.find('\n', pos + INDEX_CHUNK_SIZE)
+            cut = size if cut == -1 else cut + 1
+            words = {}
+            for m in self.pattern.finditer(text, pos, cut):
+                words.setdefault(m.group(0), []).append(m.start(0) - pos)
+            starts.append(start + pos)
+            lengths.append(cut - pos)
+            chunks.append(words)
+            pos = cut
+        return starts, lengths, chunks
+
+    def build(self, text, change_count):
+        """Index the entire buffer."""
+
+        starts, lengths, chunks = self.tokenize(text, 0)
+        with self.lock:
+            self.starts = starts
+            self.lengths = lengths
+            self.chunks = chunks
+            self.change_count = change_count
+
+    def update(self, view, changes):
+        """
+        Update the index from a list of `(begin, end, inserted_length)` edits.
+
+        The edits are applied in order, each relative to the buffer as left by the previous one.
+        Chunks touched by an edit are merged and marked dirty, and only the dirty chunks are
+        re-read from the buffer and re-tokenized once all the edits are accounted for.
+        """
+
+        with self.lock:
+            for begin, end, inserted in changes:
+                delta = inserted - (end - begin)
+                if not self.starts:
+                    self.starts = [0]
+                    self.lengths = [0]
+                    self.chunks = [None]
+                first = max(0, bisect.bisect_right(self.starts, begin) - 1)
+                last = first
+                while last + 1 < len(self.starts) and self.starts[last + 1] <= end:
+                    last += 1
+                length = sum(self.lengths[first:last + 1]) + delta
+                self.starts[first + 1:last + 1] = []
+                self.lengths[first:last + 1] = [length]
+                self.chunks[first:last + 1] = [None]
+                for i in range(first + 1, len(self.starts)):
+                    self.starts[i] += delta
+
+            i = 0
+            while i < len(self.chunks):
+                if self.chunks[i] is not None:
+                    i += 1
+                    continue
+                start = self.starts[i]
+                starts, lengths, chunks = self.tokenize(
+                    view.substr(sublime.Region(start, start + self.lengths[i])), start
+                )
+                self.starts[i:i + 1] = starts
+                self.lengths[i:i + 1] = lengths
+                self.chunks[i:i + 1] = chunks
+                i += len(chunks)
+            self.change_count = view.change_count()
+
+    def find(self, word, begin, end):
+        """Return the sorted start points of the word between `begin` and `end`."""
+
+        found = []
+        size = len(word)
+        with self.lock:
+            i = max(0, bisect.bisect_right(self.starts, begin) - 1)
+            while i < len(self.starts) and self.starts[i] < end:
+                offsets = self.chunks[i].get(word)
+                if offsets:
+                    base = self.starts[i]
+                    lo = bisect.bisect_left(offsets, begin - base)
+                    hi = bisect.bisect_right(offsets, end - base - size)
+                    found.extend([base + o for o in offsets[lo:hi]])
+                i += 1
+        return found
+
+
+def build_word_index(view, separators):
+    """Build the word index for the view in the background."""
+
+    buffer_id = view.buffer_id()
+
+    def is_pending():
+        return buffer_id in word_indexes and word_indexes[buffer_id] is None
+
+    def fail():
+        # Clear the pending marker so the next lookup queues another build.
+        if is_pending():
+            del word_indexes[buffer_id]
+
+    try:
+        change_count = view.change_count()
+        text = view.substr(sublime.Region(0, view.size()))
+        index = WordIndex(separators)
+        index.build(text, change_count)
+    except Exception:
+        sublime.set_timeout(fail, 0)
+        raise
+
+    def install():
+        if not is_pending():
+            # The index was discarded while we were building it.
+            return
+        if view.change_count() != change_count:
+            # The buffer moved on while we were indexing; try again.
+            del word_indexes[buffer_id]
+            schedule_word_index(view, separators)
+            return
+        word_indexes[buffer_id] = index
+        if hasattr(sublime_plugin, 'TextChangeListener'):
+            listener = HighlightWordIndexListener(index, view)
+            listener.attach(view.buffer())
+
+    sublime.set_timeout(install, 0)
+
+
+def schedule_word_index(view, separators):
+    """Queue a (re)build of the view's word index."""
+
+    buffer_id = view.buffer_id()
+    if executor is None or word_indexes.get(buffer_id, False) is None:
+        return
+    # `None` marks a build as pending.
+    word_indexes[buffer_id] = None
+    executor.submit(build_word_index, view, separators)
+
+
+def get_word_index(view, separators):
+    """
+    Get the view's word index if it is up to date.
+
+    If there is no index, or it was built with other separators, a build is queued,
+    and `None` is returned until it is ready.
+    """
+
+    index = word_indexes.get(view.buffer_id())
+    if index is None:
+        if view.buffer_id() not in word_indexes:
+            schedule_word_index(view, separators)
+        return None
+    if index.separators != separators:
+        del word_indexes[view.buffer_id()]
+        schedule_word_index(view, separators)
+        return None
+    if index.change_count != view.change_count():
+        return None
+    return index
+
+
+def discard_word_index(buffer_id):
+    """Forget the buffer's word index."""
+
+    index = word_indexes.pop(buffer_id, None)
+    if index is not None:
+        listener = getattr(index, 'listener', None)
+        if listener is not None and listener.is_attached():
+            listener.detach()
+
+
+if hasattr(sublime_plugin, 'TextChangeListener'):
+    class HighlightWordIndexListener(sublime_plugin.TextChangeListener):
+        """Keep a word index in sync with the edits made to its buffer."""
+
+        def __init__(self, index, view):
+            """Setup."""
+
+            sublime_plugin.TextChangeListener.__init__(self)
+            self.index = index
+            self.view = view
+            index.listener = self
+
+        def on_text_changed(self, changes):
+            """Apply the edits to the index."""
+
+            if word_indexes.get(self.view.buffer_id()) is not self.index:
+                self.detach()
+                return
+            self.index.update(self.view, [(c.a.pt, c.b.pt, len(c.str)) for c in changes])
+
+
+class ResultCache(object):
+    """
+    LRU cache of highlight results.
+
+    Entries are keyed by view, buffer version, selected words, and visible region,
+    and are evicted, least recently used first, once the estimated memory use exceeds the budget.
+    """
+
+    def __init__(self, budget=0):
+        """Setup."""
+
+        self.entries = OrderedDict()
+        self.budget = budget
+        self.used = 0
+
+    @staticmethod
+    def cost(scanned):
+        """Estimate the memory used by an entry."""
+
+        return CACHE_ENTRY_COST + CACHE_REGION_COST * sum(len(r) for r in scanned['results'])
+
+    def get(self, key):
+        """Get an entry and mark it as recently used."""
+
+        scanned = self.entries.get(key)
+        if scanned is not None:
+            self.entries.move_to_end(key)
+        return scanned
+
+    def put(self, key, scanned):
+        """Add an entry, evicting old entries if over budget."""
+
+        self.remove(key)
+        cost = self.cost(scanned)
+        if cost > self.budget:
+            return
+        self.entries[key] = scanned
+        self.used += cost
+        while self.used > self.budget:
+            self.used -= self.cost(self.entries.popitem(last=False)[1])
+
+    def remove(self, key):
+        """Remove an entry."""
+
+        scanned = self.entries.pop(key, None)
+        if scanned is not None:
+            self.used -= self.cost(scanned)
+
+    def discard_view(self, view_id):
+        """Remove all the entries for a view."""
+
+        for key in [k for k in self.entries if k[0] == view_id]:
+            self.remove(key)
+
+    def resize(self, budget):
+        """Change the budget."""
+
+        self.budget = budget
+        while self.used > self.budget:
+            self.used -= self.cost(self.entries.popitem(last=False)[1])
+
+
+result_cache = ResultCache()
+
+
+# The search is performed shortly after the most recent event
 # in order to prevent the search happening on every key press.
-# Each of the event handlers simply marks the time of the most recent
-# event and a timer periodically executes do_search
+# Each of the event handlers simply arms the timer in `HwThread`,
+# which then executes do_search once things settle down.
 class HighlightWord(object):
     """HighlightWord."""
 
@@ -121,14 +985,57 @@ class HighlightWord(object):
         """Setup."""
 
         self.previous_region = sublime.Region(0, 0)
+        self.scanned = None
+        self.decorated = {}
+        self.pinned = ()
+        self.pins_key = None
+        self.counting = None
+        self.load_settings()
+
+    def load_settings(self):
+        """Load the settings."""
+
         self.theme_selectors = tuple(settings.get('highlight_scopes', [SCOPE]))
         self.word_select = settings.get('require_word_select', False)
         style = settings.get('highlight_style', 'outline')
         self.style = highlight_style(style)
         self.underline = style == 'underline'
+        self.region_budget = int(settings.get('region_budget', 5000))
+        self.budget_policy = settings.get('region_budget_policy', 'viewport')
         self.max_selections = len(self.theme_selectors)
         self.sel_threshold = int(settings.get('selection_threshold', -1))
-
+        self.overflow = settings.get('selection_overflow', 'first')
+        self.use_index = bool(settings.get('use_word_index', False))
+        stats.enabled = bool(settings.get('enable_stats', False))
+        self.debounce_min = max(0, int(settings.get('debounce_min', 20))) / 1000.0
+        self.debounce_max = max(self.debounce_min, int(settings.get('debounce_max', 500)) / 1000.0)
+        self.all_views = bool(settings.get('highlight_visible_views', False))
+        self.ignore_scopes = settings.get('ignore_scopes', '')
+        self.match_count = bool(settings.get('show_match_count', False))
+        result_cache.resize(max(0, int(settings.get('result_cache_budget', 1024))) * 1024)
+        self.load_pins()
+        if not self.use_index:
+            for buffer_id in list(word_indexes.keys()):
+                discard_word_index(buffer_id)
+
+    def load_pins(self):
+        """Load the pinned words, and clear the old highlights if they changed."""
+
+        pinned = tuple(
+            sorted((word, scope or SCOPE) for word, scope in settings.get('pinned_words', {}).items() if word)
+        )
+        if pinned == self.pinned:
+            return
+        for win in sublime.windows():
+            for view in win.views():
+                clear_pinned(view)
+        self.pinned = pinned
+        self.pins_key = None
+        self.pin_words = tuple(p[0] for p in pinned)
+        self.pin_scopes = sorted(set(p[1] for p in pinned))
+        self.pin_groups = [self.pin_scopes.index(p[1]) for p in pinned]
+
+    @timed('do_search')
     def do_search(self, view, force=True):
         """Perform the search for the highlighted word."""
 
@@ -138,130 +1045,505 @@ class HighlightWord(object):
 
         if reload_flag:
             reload_flag = False
-            self.theme_selectors = tuple(settings.get('highlight_scopes', [SCOPE]))
-            self.max_selections = len(self.theme_selectors)
-            self.word_select = settings.get('require_word_select', False)
-            style = settings.get('highlight_style', 'outline')
-            self.style = highlight_style(style)
-            self.underline = style == 'underline'
-            self.sel_threshold = int(settings.get('selection_threshold', -1))
+            self.load_settings()
             force = True
 
         visible_region = view.visible_region()
         if not force and self.previous_region == visible_region:
             return
 
-        clear_regions()
+        if self.pinned:
+            self.highlight_pinned(view, visible_region)
 
-        # The default separator does not include whitespace, so I add that here no matter what
-        separator_string = view.settings().get('word_separators', "") + " \n\r\t"
-
-        current_words = []
-        current_regions = []
-        good_words = set()
-        words = []
-
-        selections = view.sel()
-        sel_len = len(selections)
-        if sel_len > 0 and (self.sel_threshold == -1 or self.sel_threshold >= sel_len):
-            self.previous_region = visible_region
-
-            # Reduce m*n search to just n by mapping each word
-            # separator character into a dictionary
-            self.separators = {}
-            for c in separator_string:
-                self.separators[c] = True
-
-            for selection in selections:
-                current_regions.append(view.word(selection))
-                current_words.append(
-                    view.substr(current_regions[-1]).strip(separator_string)
-                )
+        # If only the viewport moved, just scan what scrolled into view.
+        if not force and self.scroll(view, visible_region):
+            return
 
-            count = 0
-            for word in current_words:
-                if word not in good_words:
-                    if count != self.max_selections:
-                        good_words.add(word)
-                        words.append((word, current_regions[count]))
-                        count += 1
-                    else:
-                        return
+        self.scanned = None
 
-        count = 0
-        for word in words:
-            key = KEY + str(count)
-            selector = self.theme_selectors[count]
+        # The default separator does not include whitespace, so I add that here no matter what
+        self.separator_string = view.settings().get('word_separators', "") + " \n\r\t"
 
-            # See if a word is selected or if you are just in a word
-            if self.word_select and word[1].size() != selections[count].size():
-                continue
+        self.previous_region = visible_region
+        valid_words = get_words(
+            view, self.separator_string, self.max_selections,
+            self.word_select, self.sel_threshold, self.overflow
+        )
 
-            # remove leading/trailing separator characters just in case
-            if len(word[0]) == 0:
-                continue
+        if valid_words:
+            self.highlight_word(view, valid_words)
+        else:
+            next_generation(view)
+            clear_regions(view)
+            self.clear_others()
+            if self.match_count:
+                self.counting = None
+                view.erase_status(COUNT_STATUS)
+
+    def highlight_pinned(self, view, visible_region):
+        """
+        Highlight the pinned words in the visible region.
+
+        However many words are pinned, they are all found with a single pass of the automaton
+        over the text, off the main thread. Nothing is searched again until the view,
+        its buffer, or the visible region changes.
+        """
+
+        key = (view.id(), view.change_count(), visible_region.begin(), visible_region.end(), self.ignore_scopes)
+        if key == self.pins_key:
+            return
+        self.pins_key = key
+
+        separators = frozenset(view.settings().get('word_separators', "") + " \n\r\t")
+        size = view.size()
+        pad = max(len(w) for w in self.pin_words)
+        begin = max(0, visible_region.begin() - pad)
+        end = min(size, visible_region.end() + pad)
+        offset = max(0, begin - 1)
+        if stats.enabled:
+            stats.count(view, 'substr calls')
+        text = view.substr(sublime.Region(offset, min(size, end + 1)))
+        runs = get_scope_runs(view, self.ignore_scopes, begin, end) if self.ignore_scopes else None
+        automaton = compile_pins(self.pin_words)
+
+        def work():
+            results = find_pinned(text, offset, automaton, separators, begin, end)
+            if runs is not None:
+                results = [filter_scopes(regions, runs) for regions in results]
+            return results
+
+        def done(results):
+            if self.pins_key == key:
+                self.show_pinned(view, results)
+
+        if executor is None:
+            done(work())
+            return
 
-            # ignore the selection if it spans multiple words
-            abort = False
-            for c in word[0]:
-                if c in self.separators:
-                    abort = True
-                    break
-            if abort:
-                continue
+        def task():
+            start = perf_counter()
+            results = work()
+            if stats.enabled:
+                stats.time(view, 'pinned', perf_counter() - start)
+            sublime.set_timeout(lambda: done(results), 0)
 
-            self.highlight_word(view, key, selector, word[1], word[0])
-            count += 1
+        executor.submit(task)
 
-    def highlight_word(self, view, key, selector, current_region, current_word):
-        """Find and highlight word."""
+    def show_pinned(self, view, results):
+        """Draw the pinned words, with one set of regions per scope."""
 
-        size = view.size() - 1
-        search_start = max(0, self.previous_region.begin() - len(current_word))
-        search_end = min(size, self.previous_region.end() + len(current_word))
+        groups = [[] for scope in self.pin_scopes]
+        for count, regions in enumerate(results):
+            groups[self.pin_groups[count]].extend(regions)
+        visible_region = view.visible_region()
+        for count, regions in enumerate(groups):
+            if self.underline:
+                regions = list(underline(regions, visible_region))
+            if stats.enabled:
+                stats.count(view, 'regions drawn', len(regions))
+            draw_regions(view, PIN_KEY + str(count), regions, self.pin_scopes[count], self.style)
+        set_view_setting(view, 'highlight_word.pinned_regions', len(self.pin_scopes))
+
+        if hw_thread is not None and hw_thread.poll_time > 0:
+            hw_thread.watch(view)
+
+    def snapshot(self, view, begin, end):
+        """
+        Capture what is needed to search the buffer between `begin` and `end` off the main thread.
+
+        This is either the view's up to date word index, or a copy of the text
+        (with one extra character on each side so the word boundaries can be checked),
+        along with the runs of text in scopes that shouldn't be highlighted.
+        """
+
+        runs = get_scope_runs(view, self.ignore_scopes, begin, end) if self.ignore_scopes else None
+        index = get_word_index(view, self.separator_string) if self.use_index else None
+        if index is not None:
+            return (index, None, 0, begin, end, runs)
+        offset = max(0, begin - 1)
+        if stats.enabled:
+            stats.count(view, 'substr calls')
+        return (None, view.substr(sublime.Region(offset, min(view.size(), end + 1))), offset, begin, end, runs)
+
+    def submit(self, view, works, done):
+        """
+        Run each of the `works` on the worker pool, in parallel, and pass their results to `done` on the main thread.
+
+        Both are skipped if the view's selection or buffer changes (or another search is started) in the meantime.
+        """
+
+        generation = next_generation(view)
+        change_count = view.change_count()
+        start = perf_counter()
+
+        def is_current():
+            return generations.get(view.id()) == generation and view.change_count() == change_count
+
+        def finish(results):
+            done(results)
+            if hw_thread is not None:
+                hw_thread.record(view, perf_counter() - start)
+
+        if executor is None or not works:
+            finish([work() for work in works])
+            return
 
-        valid_regions = []
-        while True:
-            found_region = view.find(current_word, search_start, sublime.LITERAL)
-            if found_region is None:
-                break
+        results = [None] * len(works)
+        remaining = [len(works)]
+        lock = threading.Lock()
+
+        def task(i, work):
+            if not is_current():
+                return
+            start = perf_counter()
+            results[i] = work()
+            if stats.enabled:
+                stats.time(view, 'search', perf_counter() - start)
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                sublime.set_timeout(lambda: finish(results) if is_current() else None, 0)
+
+        for i, work in enumerate(works):
+            executor.submit(task, i, work)
+
+    def apply(self, view, count, regions, visible_region):
+        """
+        Draw the regions for the given highlight key.
+
+        If there are more regions than the budget allows, the regions are limited to the viewport,
+        drawn with a cheaper style, or skipped, depending on the policy.
+        """
+
+        style = self.style
+        expand = self.underline
+        if 0 <= self.region_budget < len(regions):
+            if self.budget_policy == 'skip':
+                erase_regions(view, KEY + str(count))
+                sublime.status_message(
+                    'HighlightWord: "%s" has more than %d matches, not highlighting' % (
+                        view.substr(regions[0]), self.region_budget
+                    )
+                )
+                return
+            elif self.budget_policy == 'cheap':
+                style = highlight_style('thin_underline')
+                expand = False
+            else:
+                begin = visible_region.begin()
+                end = visible_region.end()
+                regions = [r for r in regions if r.end() > begin and r.begin() < end]
+
+        if expand:
+            regions = list(underline(regions, visible_region))
+        if stats.enabled:
+            stats.count(view, 'regions drawn', len(regions))
+        draw_regions(view, KEY + str(count), regions, self.theme_selectors[count], style)
+
+    def cache_key(self, view, words, visible_region):
+        """Key for caching the results of highlighting the words in the given view and visible region."""
+
+        return (
+            view.id(),
+            view.change_count(),
+            tuple((w[0], w[1].begin(), w[1].end()) for w in words),
+            visible_region.begin(),
+            visible_region.end(),
+            self.ignore_scopes
+        )
 
-            # regions can have reversed start/ends so normalize them
-            start = max(0, found_region.begin())
-            end = min(size, found_region.end())
-            if search_start == end:
-                search_start += 1
-                continue
-            search_start = end
+    def draw(self, view, results):
+        """Draw the results of a search, only touching the keys whose regions changed."""
 
-            if search_start >= size:
-                break
+        if 'highlight_word.regions' not in written.get(view.id(), {}):
+            clear_regions(view)
+        visible_region = view.visible_region()
+        for count, found in enumerate(results):
+            self.apply(view, count, found, visible_region)
+        keys = set(KEY + str(count) for count in range(len(results)))
+        for key in [k for k in drawn.get(view.id(), {}) if k.startswith(KEY) and k not in keys]:
+            erase_regions(view, key)
+        set_view_setting(view, 'highlight_word.regions', self.max_selections)
+
+    def show(self, view, scanned):
+        """Draw the results of a search and remember them so scrolling only needs to look at what comes into view."""
+
+        self.draw(view, scanned['results'])
+
+        self.scanned = scanned
+        if self.match_count:
+            self.count_matches(view, scanned)
+        if hw_thread is not None and hw_thread.poll_time > 0:
+            hw_thread.watch(view)
+
+    def count_matches(self, view, scanned):
+        """
+        Show how many times each highlighted word occurs, in the whole file and in view, in the status bar.
+
+        The whole file is counted lazily: from the word index if there is one, otherwise on a worker from a
+        snapshot of the buffer. Counts are remembered until the buffer changes, and a count in progress
+        is dropped if the selection moves on to other words.
+        """
+
+        words = [w[0] for w in scanned['words']]
+        visible_region = view.visible_region()
+        begin = visible_region.begin()
+        end = visible_region.end()
+        visible = [
+            sum(1 for r in found if begin <= r.begin() < end) + (1 if begin <= w[1].begin() < end else 0)
+            for w, found in zip(scanned['words'], scanned['results'])
+        ]
+
+        change_count = view.change_count()
+        cached = match_counts.get(view.buffer_id())
+        if cached is None or cached[0] != change_count:
+            cached = (change_count, {})
+            match_counts[view.buffer_id()] = cached
+        counts = cached[1]
+
+        def status():
+            view.set_status(COUNT_STATUS, '  '.join(
+                '%s: %d match%s (%d visible)' % (w, counts[w], '' if counts[w] == 1 else 'es', v)
+                if w in counts else '%s: %d visible' % (w, v)
+                for w, v in zip(words, visible)
+            ))
+
+        missing = [w for w in words if w not in counts]
+        if not missing:
+            status()
+            return
 
-            if found_region.empty():
-                break
+        index = get_word_index(view, self.separator_string) if self.use_index else None
+        if index is not None:
+            size = view.size()
+            for word in missing:
+                counts[word] = len(index.find(word, 0, size))
+            status()
+            return
 
-            if found_region.intersects(current_region):
-                continue
+        status()
+        counting = (view.id(), change_count, tuple(missing))
+        if self.counting == counting:
+            # Already on it.
+            return
+        self.counting = counting
+        separators = self.separator_string
+        if stats.enabled:
+            stats.count(view, 'substr calls')
+        text = view.substr(sublime.Region(0, view.size()))
+
+        def is_stale():
+            return self.counting != counting
+
+        def done(found):
+            if found is None or is_stale():
+                return
+            self.counting = None
+            if view.change_count() == change_count:
+                counts.update(found)
+                status()
+
+        if executor is None:
+            done(count_words(text, missing, separators, is_stale))
+            return
 
-            # check if the character before and after the region is a separator character
-            # if it is not, then the region is part of a larger word and shouldn't match
-            # this can't be done in a regex because we would be unable to use the word_separators setting string
-            if start == 0 or view.substr(sublime.Region(start - 1, start)) in self.separators:
-                if end == size or view.substr(sublime.Region(end, end + 1)) in self.separators:
-                    valid_regions.append(found_region)
+        def task():
+            start = perf_counter()
+            found = count_words(text, missing, separators, is_stale)
+            if stats.enabled:
+                stats.time(view, 'count', perf_counter() - start)
+            sublime.set_timeout(lambda: done(found), 0)
 
-            if search_start > search_end:
-                break
+        executor.submit(task)
 
-        view.add_regions(
-            key,
-            valid_regions if not self.underline else underline(valid_regions),
-            selector,
-            "",
-            self.style
-        )
+    def other_views(self, view):
+        """Get the other visible views in the window."""
 
-        view.settings().set('highlight_word.regions', self.max_selections)
+        views = []
+        win = view.window()
+        if win is not None:
+            for group in range(win.num_groups()):
+                other = win.active_view_in_group(group)
+                if other is not None and other.id() != view.id():
+                    views.append(other)
+        return views
+
+    def clear_others(self, keep=()):
+        """Clear the highlights drawn in other views, except those in `keep`."""
+
+        keep = set(v.id() for v in keep)
+        for view_id in list(self.decorated.keys()):
+            if view_id not in keep:
+                clear_regions(self.decorated.pop(view_id))
+
+    @timed('highlight_word')
+    def highlight_word(self, view, words):
+        """
+        Find and highlight words.
+
+        If enabled, the words are also highlighted in the other visible views of the window.
+        Each view is searched in parallel, and all of the results are drawn together.
+        """
+
+        others = self.other_views(view) if self.all_views else []
+        self.clear_others(others)
+
+        pad = max(len(w[0]) for w in words)
+        works = []
+        targets = []
+        for other in others:
+            # The words' own selections only need to be skipped in clones of the view.
+            if other.buffer_id() != view.buffer_id():
+                other_words = [(w[0], sublime.Region(-1, -1)) for w in words]
+            else:
+                other_words = words
+            other_region = other.visible_region()
+            snapshot = self.snapshot(
+                other, max(0, other_region.begin() - pad), min(other.size(), other_region.end() + pad)
+            )
+            works.append(functools.partial(search_snapshot, snapshot, other_words, self.separator_string))
+            targets.append((other, other.change_count()))
+
+        key = self.cache_key(view, words, self.previous_region)
+        scanned = result_cache.get(key)
+        if scanned is not None:
+            # Nothing has changed since we were last here; just restore the highlights.
+            if works:
+                self.submit(view, works, lambda results: self.show_others(targets, results))
+            else:
+                next_generation(view)
+            self.show(view, scanned)
+            return
+
+        search_start = max(0, self.previous_region.begin() - pad)
+        search_end = min(view.size(), self.previous_region.end() + pad)
+        works.insert(0, functools.partial(
+            search_snapshot, self.snapshot(view, search_start, search_end), words, self.separator_string
+        ))
+        change_count = view.change_count()
+
+        def done(results):
+            scanned = {
+                'view': view.id(),
+                'change_count': change_count,
+                'words': words,
+                'pad': pad,
+                'begin': search_start,
+                'end': search_end,
+                'results': results[0]
+            }
+            result_cache.put(key, scanned)
+            self.show(view, scanned)
+            self.show_others(targets, results[1:])
+
+        self.submit(view, works, done)
+
+    def show_others(self, targets, results):
+        """Draw the results for the other visible views."""
+
+        for (other, change_count), found in zip(targets, results):
+            if other.change_count() != change_count:
+                continue
+            self.draw(other, found)
+            self.decorated[other.id()] = other
+
+    def scroll(self, view, visible_region):
+        """
+        Update the highlights after the viewport has moved.
+
+        Only the band that scrolled into view (overlapping the old window by the word length)
+        is scanned and merged into the last results. Matches that are more than a screen away
+        from the view are dropped, and only the keys whose matches changed are redrawn.
+
+        Returns `False` if there are no usable results, in which case a full search is needed.
+        """
+
+        scanned = self.scanned
+        if scanned is None or scanned['view'] != view.id() or scanned['change_count'] != view.change_count():
+            return False
+
+        size = view.size()
+        pad = scanned['pad']
+        begin = max(0, visible_region.begin() - pad)
+        end = min(size, visible_region.end() + pad)
+        old_begin = scanned['begin']
+        old_end = scanned['end']
+
+        # The view jumped, there is nothing to reuse.
+        if end <= old_begin or begin >= old_end:
+            return False
+
+        words = scanned['words']
+        works = []
+        if begin < old_begin:
+            works.append(functools.partial(
+                search_snapshot, self.snapshot(view, begin, min(size, old_begin + pad)), words, self.separator_string
+            ))
+        if end > old_end:
+            works.append(functools.partial(
+                search_snapshot, self.snapshot(view, max(0, old_end - pad), end), words, self.separator_string
+            ))
+
+        keep_begin = max(0, visible_region.begin() - visible_region.size())
+        keep_end = min(size, visible_region.end() + visible_region.size())
+        self.previous_region = visible_region
+
+        def done(bands):
+            if self.scanned is not scanned:
+                return
+            results = []
+            for count, old in enumerate(scanned['results']):
+                merged = {r.begin(): r for r in old if r.end() > keep_begin and r.begin() < keep_end}
+                for band in bands:
+                    for r in band[count]:
+                        merged[r.begin()] = r
+                found = [merged[pt] for pt in sorted(merged)]
+                # Only redrawn if what is drawn changes (underlines and budget-limited keys only cover the viewport).
+                self.apply(view, count, found, visible_region)
+                results.append(found)
+
+            updated = dict(scanned)
+            updated['begin'] = max(keep_begin, min(begin, old_begin))
+            updated['end'] = min(keep_end, max(end, old_end))
+            updated['results'] = results
+            self.scanned = updated
+            result_cache.put(self.cache_key(view, words, visible_region), updated)
+            if self.match_count:
+                self.count_matches(view, updated)
+
+        self.submit(view, works, done)
+        return True
+
+
+def search_snapshot(snapshot, words, separators):
+    """
+    Search a snapshot from `HighlightWord.snapshot` for the words.
+
+    This makes no API calls, so it is safe to run on a worker. All of the words are found with a single pass over
+    the text (or an index lookup). Occurrences overlapping the word's own selection, or in an ignored scope,
+    are left out.
+    """
+
+    index, text, offset, begin, end, runs = snapshot
+    if index is not None:
+        results = [
+            [sublime.Region(pt, pt + len(w[0])) for pt in index.find(w[0], begin, end)]
+            for w in words
+        ]
+    else:
+        results = find_words(text, offset, [w[0] for w in words], separators, begin, end)
+    if runs is not None:
+        results = [filter_scopes(found, runs) for found in results]
+    return [[r for r in found if not r.intersects(words[count][1])] for count, found in enumerate(results)]
+
+
+def next_generation(view):
+    """Start a new generation for the view, making any search in flight for it stale."""
+
+    generation = generations.get(view.id(), 0) + 1
+    generations[view.id()] = generation
+    return generation
 
 
 class HighlightWordListenerCommand(sublime_plugin.EventListener):
@@ -272,9 +1554,49 @@ class HighlightWordListenerCommand(sublime_plugin.EventListener):
 
         if hw_thread is None or hw_thread.ignore_all:
             return
-        now = time()
-        hw_thread.modified = True
-        hw_thread.time = now
+        next_generation(view)
+        hw_thread.schedule(view)
+
+    def on_activated(self, view):
+        """Highlight the newly focused view."""
+
+        if hw_thread is None or hw_thread.ignore_all:
+            return
+        hw_thread.schedule(view)
+
+    def on_modified(self, view):
+        """
+        Discard searches in flight.
+
+        Without text change events, also rebuild a stale word index once editing pauses.
+        """
+
+        next_generation(view)
+        if hasattr(sublime_plugin, 'TextChangeListener') or not word_indexes.get(view.buffer_id()):
+            return
+
+        change_count = view.change_count()
+        separators = word_indexes[view.buffer_id()].separators
+
+        def rebuild():
+            if view.change_count() == change_count and word_indexes.get(view.buffer_id()):
+                schedule_word_index(view, separators)
+
+        sublime.set_timeout(rebuild, INDEX_REBUILD_DELAY)
+
+    def on_close(self, view):
+        """Forget everything kept for the closed view, and stop any background selection."""
+
+        discard_word_index(view.buffer_id())
+        scope_runs.pop(view.buffer_id(), None)
+        match_counts.pop(view.buffer_id(), None)
+        cancel_select(view)
+        generations.pop(view.id(), None)
+        result_cache.discard_view(view.id())
+        drawn.pop(view.id(), None)
+        written.pop(view.id(), None)
+        if hw_thread is not None:
+            hw_thread.forget(view)
 
 
 class HighlightWordSelectCommand(sublime_plugin.TextCommand):
@@ -283,151 +1605,406 @@ class HighlightWordSelectCommand(sublime_plugin.TextCommand):
     def run(self, edit):
         """Run the command."""
 
-        theme_selectors = tuple(settings.get('highlight_scopes', [SCOPE]))
-        max_selections = len(theme_selectors)
-        word_select = settings.get('require_word_select', False)
-
-        current_words = []
-        current_regions = []
-        good_words = set()
-        words = []
-
-        separator_string = self.view.settings().get('word_separators', "") + " \n\r\t"
-        selections = self.view.sel()
-        sel_len = len(selections)
-        if sel_len > 0:
-            # Reduce m*n search to just n by mapping each word
-            # separator character into a dictionary
-            self.separators = {}
-            for c in separator_string:
-                self.separators[c] = True
-
-            for selection in selections:
-                current_regions.append(self.view.word(selection))
-                current_words.append(
-                    self.view.substr(current_regions[-1]).strip(separator_string)
-                )
+        # The default separator does not include whitespace, so I add that here no matter what
+        self.separator_string = self.view.settings().get('word_separators', "") + " \n\r\t"
+
+        valid_words = get_words(
+            self.view,
+            self.separator_string,
+            len(settings.get('highlight_scopes', [SCOPE])),
+            settings.get('require_word_select', False),
+            int(settings.get('selection_threshold', -1)),
+            settings.get('selection_overflow', 'first')
+        )
+        self.select_words([w[0] for w in valid_words])
 
-            count = 0
-            for word in current_words:
-                if word not in good_words:
-                    if count != max_selections:
-                        good_words.add(word)
-                        words.append((word, current_regions[count]))
-                        count += 1
-                    else:
-                        return
+    @timed('select_word')
+    def select_words(self, words):
+        """
+        Select all instances of the words in the buffer.
 
-        count = 0
-        select_regions = []
-        for word in words:
-            key = KEY + str(count)
-            selector = theme_selectors[count]
+        If the buffer is indexed, the index is read directly. Otherwise, a snapshot of the buffer is
+        scanned in the background, and the selection is applied when the scan completes.
+        """
 
-            # See if a word is selected or if you are just in a word
-            if word_select and word[1].size() != selections[count].size():
-                continue
+        if not words:
+            return
 
-            # remove leading/trailing separator characters just in case
-            if len(word[0]) == 0:
-                continue
+        cancel_select(self.view)
+
+        limit = int(settings.get('select_max_matches', 10000))
+        size = self.view.size()
+        index = get_word_index(self.view, self.separator_string) if settings.get('use_word_index', False) else None
+        if index is not None:
+            select_regions = []
+            for word in words:
+                select_regions.extend([sublime.Region(pt, pt + len(word)) for pt in index.find(word, 0, size)])
+            if limit >= 0 and len(select_regions) > limit:
+                select_regions.sort(key=lambda r: r.begin())
+                del select_regions[limit:]
+                sublime.status_message("HighlightWord: selection limited to %d matches" % limit)
+            if select_regions:
+                self.view.sel().clear()
+                self.view.sel().add_all(select_regions)
+            return
 
-            # ignore the selection if it spans multiple words
-            abort = False
-            for c in word[0]:
-                if c in self.separators:
-                    abort = True
-                    break
-            if abort:
-                continue
+        job = SelectJob(self.view, words, self.separator_string, limit)
+        select_jobs[self.view.id()] = job
+        self.view.settings().set('highlight_word.selecting', True)
+        job.start()
 
-            select_regions += self.select_word(key, selector, word[0])
-            count += 1
 
-        if select_regions:
-            self.view.sel().clear()
-            self.view.sel().add_all(select_regions)
+def cancel_select(view):
+    """Cancel a background selection in the given view."""
 
-    def select_word(self, key, selector, current_word):
-        """Find and highlight word."""
+    job = select_jobs.pop(view.id(), None)
+    if job is not None:
+        job.cancel()
+        view.settings().erase('highlight_word.selecting')
+        view.erase_status(SELECT_STATUS)
 
-        size = self.view.size() - 1
-        search_start = 0
 
-        valid_regions = []
-        while True:
-            found_region = self.view.find(current_word, search_start, sublime.LITERAL)
-            if found_region is None:
-                break
+class SelectJob(threading.Thread):
+    """Find all instances of words in a snapshot of the buffer, a chunk at a time."""
 
-            # regions can have reversed start/ends so normalize them
-            start = max(0, found_region.begin())
-            end = min(size, found_region.end())
-            if search_start == end:
-                search_start += 1
-                continue
-            search_start = end
+    def __init__(self, view, words, separators, limit):
+        """Setup."""
+
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.view = view
+        self.words = words
+        self.separators = separators
+        self.limit = limit
+        self.change_count = view.change_count()
+        self.text = view.substr(sublime.Region(0, view.size()))
+        if stats.enabled:
+            stats.count(view, 'substr calls')
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop the scan."""
+
+        self.cancelled.set()
+
+    def is_stale(self):
+        """Check if the job was cancelled or the buffer changed underneath it."""
+
+        return self.cancelled.is_set() or self.view.change_count() != self.change_count
+
+    def status(self, percent):
+        """Report progress in the status bar."""
+
+        def report():
+            if not self.is_stale():
+                self.view.set_status(SELECT_STATUS, "HighlightWord: selecting... %d%%" % percent)
+
+        sublime.set_timeout(report, 0)
+
+    def finish(self, regions, limited):
+        """Apply the selection on the main thread."""
+
+        if select_jobs.get(self.view.id()) is not self:
+            return
+        if self.is_stale():
+            cancel_select(self.view)
+            return
+        cancel_select(self.view)
+        if limited:
+            sublime.status_message("HighlightWord: selection limited to %d matches" % self.limit)
+        if regions:
+            self.view.sel().clear()
+            self.view.sel().add_all(regions)
 
-            if search_start >= size:
+    def run(self):
+        """Scan the snapshot."""
+
+        if stats.enabled:
+            start = perf_counter()
+            self.scan()
+            stats.time(self.view, 'select_scan', perf_counter() - start)
+        else:
+            self.scan()
+
+    def scan(self):
+        """Scan the snapshot in chunks."""
+
+        text = self.text
+        size = len(text)
+        overlap = max(len(w) for w in self.words)
+        regions = []
+        limited = False
+        begin = 0
+        last_end = 0
+        percent = -1
+        while True:
+            if self.is_stale():
+                sublime.set_timeout(lambda: self.finish([], False), 0)
+                return
+
+            end = min(size, begin + SELECT_CHUNK_SIZE)
+            found = []
+            for matches in find_words(text, 0, self.words, self.separators, begin, end):
+                # The chunks overlap so words straddling a chunk boundary are not lost,
+                # so skip anything the previous chunk already found.
+                found.extend([r for r in matches if r.end() > last_end])
+            found.sort(key=lambda r: r.begin())
+            regions.extend(found)
+
+            if self.limit >= 0 and len(regions) > self.limit:
+                del regions[self.limit:]
+                limited = True
                 break
 
-            if found_region.empty():
+            if end >= size:
                 break
+            last_end = end
+            begin = end - overlap
+
+            current = end * 100 // size
+            if current != percent:
+                percent = current
+                self.status(percent)
+
+        self.text = None
+        sublime.set_timeout(lambda: self.finish(regions, limited), 0)
 
-            # check if the character before and after the region is a separator character
-            # if it is not, then the region is part of a larger word and shouldn't match
-            # this can't be done in a regex because we would be unable to use the word_separators setting string
-            if start == 0 or self.view.substr(sublime.Region(start - 1, start)) in self.separators:
-                if end == size or self.view.substr(sublime.Region(end, end + 1)) in self.separators:
-                    valid_regions.append(found_region)
 
-        return valid_regions
+class HighlightWordPinCommand(sublime_plugin.TextCommand):
+    """Pin (or unpin) the selected word(s), so they are always highlighted."""
+
+    def run(self, edit, clear=False):
+        """Run the command."""
+
+        pinned = {} if clear else dict(settings.get('pinned_words', {}))
+        if not clear:
+            separator_string = self.view.settings().get('word_separators', "") + " \n\r\t"
+            words = [w[0] for w in get_words(self.view, separator_string, len(self.view.sel()))]
+            if not words:
+                return
+            if all(w in pinned for w in words):
+                for word in words:
+                    del pinned[word]
+                sublime.status_message("HighlightWord: unpinned %d word(s)" % len(words))
+            else:
+                scopes = settings.get('highlight_scopes', [SCOPE])
+                words = [w for w in words if w not in pinned]
+                for word in words:
+                    pinned[word] = scopes[len(pinned) % len(scopes)]
+                sublime.status_message("HighlightWord: pinned %d word(s)" % len(words))
+        settings.set('pinned_words', pinned)
+        sublime.save_settings("highlight_word.sublime-settings")
+        if hw_thread is not None:
+            hw_thread.schedule(self.view)
+
+
+class HighlightWordSelectCancelCommand(sublime_plugin.TextCommand):
+    """Cancel a running select of all instances of the selected word(s)."""
+
+    def run(self, edit):
+        """Run the command."""
+
+        cancel_select(self.view)
+        sublime.status_message("HighlightWord: selection cancelled")
+
+    def is_enabled(self):
+        """Only enable if a selection is running."""
+
+        return self.view.id() in select_jobs
+
+
+class HighlightWordStatsCommand(sublime_plugin.ApplicationCommand):
+    """Print the collected stats to the console, or reset them."""
+
+    def run(self, reset=False):
+        """Run the command."""
+
+        if reset:
+            stats.reset()
+            sublime.status_message("HighlightWord: stats reset")
+        else:
+            print(stats.report())
+            if hw_thread is not None:
+                print(hw_thread.report())
+            sublime.active_window().run_command('show_panel', {'panel': 'console'})
 
 
 class HwThread(threading.Thread):
-    """Load up defaults."""
+    """
+    Debounce highlight requests.
+
+    The thread sleeps until an event arms the timer, so nothing runs while the editor is idle.
+    Bursts of events just push the deadline back and are coalesced into a single search.
+    While the active view has highlights, the viewport is checked from this thread
+    and a search is only posted to the main thread if it has actually moved.
+
+    How long to wait (and how often to poll) adapts to what searching each view has recently cost,
+    so cheap views highlight almost at once, while costly ones back off enough that searches don't pile up.
+    """
 
     def __init__(self):
         """Setup the thread."""
+
+        self.condition = threading.Condition()
         self.reset()
         threading.Thread.__init__(self)
+        self.daemon = True
 
     def reset(self):
         """Reset the thread variables."""
-        self.wait_time = 0.12
-        self.time = time()
-        self.modified = False
+
+        self.wait_time = DEBOUNCE_DEFAULT
+        self.poll_time = self.poll_for(self.wait_time)
+        self.costs = {}
+        self.deadline = None
+        self.force = False
         self.ignore_all = False
         self.abort = False
+        self.watch_view = None
+        self.watch_region = None
+        self.next_poll = 0.0
+
+    @staticmethod
+    def poll_for(delay):
+        """Get the poll interval to use with a debounce delay."""
+
+        return min(POLL_MAX, max(POLL_MIN, delay * POLL_FACTOR))
+
+    def record(self, view, seconds):
+        """Record what a search of the view cost."""
+
+        cost = self.costs.get(view.id())
+        if cost is None or seconds > cost:
+            cost = seconds
+        else:
+            cost += (seconds - cost) * DEBOUNCE_DECAY
+        self.costs[view.id()] = cost
+
+    def forget(self, view):
+        """Forget a closed view's search cost."""
+
+        self.costs.pop(view.id(), None)
+
+    @staticmethod
+    def delay_for(cost):
+        """Get the debounce delay for a search cost (`None` if unknown), within the configured bounds."""
+
+        delay = DEBOUNCE_DEFAULT if cost is None else cost * DEBOUNCE_FACTOR
+        if highlight_word is None:
+            return delay
+        return min(highlight_word.debounce_max, max(highlight_word.debounce_min, delay))
+
+    def delay(self, view):
+        """Get the debounce delay for the view, from its recent search cost."""
+
+        return self.delay_for(self.costs.get(view.id()) if view is not None else None)
+
+    def report(self):
+        """Format the effective debounce delay and poll interval of each view."""
+
+        lines = ['HighlightWord Debounce']
+        for view_id, cost in sorted(self.costs.items()):
+            delay = self.delay_for(cost)
+            lines.append(
+                '  view %d: delay=%.0fms  poll=%.0fms  (recent search cost %.1fms)' % (
+                    view_id, delay * 1000, self.poll_for(delay) * 1000, cost * 1000
+                )
+            )
+        if len(lines) == 1:
+            lines.append('  delay=%.0fms  poll=%.0fms  (nothing searched yet)' % (
+                self.wait_time * 1000, self.poll_time * 1000
+            ))
+        return '\n'.join(lines)
+
+    def schedule(self, view=None, force=True):
+        """Arm (or re-arm) the timer, with the delay for the view."""
+
+        with self.condition:
+            self.wait_time = self.delay(view)
+            self.deadline = time() + self.wait_time
+            self.force = self.force or force
+            self.condition.notify()
+
+    def watch(self, view):
+        """Watch the viewport of the given view, or stop watching if `None`."""
+
+        with self.condition:
+            self.watch_view = view
+            self.watch_region = view.visible_region() if view is not None else None
+            if view is not None:
+                self.poll_time = self.poll_for(self.delay(view))
+            self.next_poll = time() + self.poll_time
+            self.condition.notify()
 
     def payload(self, force=False):
         """Code to run."""
 
-        self.modified = False
         # Ignore selection and edit events inside the routine
         self.ignore_all = True
+        view = None
         if highlight_word is not None:
-            highlight_word.do_search(sublime.active_window().active_view(), force)
+            win = sublime.active_window()
+            if win is not None:
+                view = win.active_view()
+            highlight_word.do_search(view, force)
         self.ignore_all = False
-        self.time = time()
+
+        # Only keep an eye on the viewport if there is something highlighted to keep in sync.
+        if (
+            view is not None and self.poll_time > 0 and
+            (view.settings().get('highlight_word.regions', 0) or (highlight_word is not None and highlight_word.pinned))
+        ):
+            self.watch(view)
+        else:
+            self.watch(None)
 
     def kill(self):
         """Kill thread."""
 
-        self.abort = True
-        while self.is_alive():
-            pass
+        with self.condition:
+            self.abort = True
+            self.condition.notify()
+        if self.is_alive():
+            self.join()
         self.reset()
 
+    def ready(self):
+        """Check if a search should be posted (call with the condition held)."""
+
+        now = time()
+        if self.deadline is not None:
+            return now >= self.deadline
+        if self.watch_view is not None and now >= self.next_poll:
+            self.next_poll = now + self.poll_time
+            if self.watch_view.visible_region() != self.watch_region:
+                self.watch_view = None
+                return True
+        return False
+
+    def timeout(self):
+        """Time to sleep until something may need doing (call with the condition held)."""
+
+        if self.deadline is not None:
+            return max(0.0, self.deadline - time())
+        if self.watch_view is not None:
+            return max(0.0, self.next_poll - time())
+        return None
+
     def run(self):
         """Thread loop."""
 
-        while not self.abort:
-            if self.modified is True and time() - self.time > self.wait_time:
-                sublime.set_timeout(lambda: self.payload(force=True), 0)
-            elif not self.modified:
-                sublime.set_timeout(self.payload, 0)
-            sleep(0.5)
+        while True:
+            with self.condition:
+                while not self.abort and not self.ready():
+                    self.condition.wait(self.timeout())
+                    if stats.enabled:
+                        stats.count(None, 'wakeups')
+                if self.abort:
+                    break
+                force = self.force
+                self.deadline = None
+                self.force = False
+            sublime.set_timeout(functools.partial(self.payload, force), 0)
 
 
 def set_reload():
@@ -446,7 +2023,10 @@ def plugin_loaded():
 
     global highlight_word
     global hw_thread
+    global executor
     set_reload()
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=WORKERS)
     highlight_word = HighlightWord()
 
     if hw_thread is not None:
@@ -458,5 +2038,22 @@ def plugin_loaded():
 def plugin_unloaded():
     """Kill thread."""
 
-    hw_thread.kill()
+    global executor
+
+    if hw_thread is not None:
+        hw_thread.kill()
+    if executor is not None:
+        executor.shutdown(wait=False)
+        executor = None
+    for buffer_id in list(word_indexes.keys()):
+        discard_word_index(buffer_id)
+    for job in list(select_jobs.values()):
+        cancel_select(job.view)
+    if highlight_word is not None:
+        highlight_word.clear_others()
+        if highlight_word.pinned or highlight_word.match_count:
+            for win in sublime.windows():
+                for view in win.views():
+                    clear_pinned(view)
+                    view.erase_status(COUNT_STATUS)
     clear_regions()
@@ -0,0 +1,179 @@
+"""Test ASCII Table."""
+import json
+import os
+import pickle
+import tempfile
+import unittest
+
+from benchmarks import fake_sublime
+
+fake_sublime.install()
+
+import ascii_table  # noqa: E402
+
+
+class TestUnicodeNames(unittest.TestCase):
+    """Test the Unicode character descriptions."""
+
+    def test_letters(self):
+        """Test that letters keep their case, like the ASCII table's own rows."""
+
+        self.assertEqual(ascii_table.unicode_entry(0x100)[2], 'Latin capital letter A with macron')
+        self.assertEqual(ascii_table.unicode_entry(0x101)[2], 'Latin small letter a with macron')
+        self.assertEqual(ascii_table.unicode_entry(0x152)[2], ascii_table.ASCII_INFO[140][2])
+        self.assertEqual(ascii_table.unicode_entry(0x1c5)[2], 'Latin capital letter D with small letter z with caron')
+        self.assertEqual(ascii_table.unicode_entry(0x391)[2], 'Greek capital letter Alpha')
+        self.assertEqual(ascii_table.unicode_entry(0x3b1)[2], 'Greek small letter alpha')
+        self.assertEqual(ascii_table.unicode_entry(0x1d400)[2], 'Mathematical bold capital A')
+
+    def test_acronyms(self):
+        """Test that acronyms and numbers keep their case."""
+
+        self.assertEqual(ascii_table.unicode_entry(0x4e00)[2], 'CJK unified ideograph-4E00')
+        self.assertEqual(ascii_table.unicode_entry(0x2460)[2], 'Circled digit one')
+        self.assertEqual(ascii_table.unicode_entry(0x2603)[2], 'Snowman')
+
+
+class TestUnicodeIndex(unittest.TestCase):
+    """Test the Unicode search index."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the index once."""
+
+        cls.index = ascii_table.UnicodeIndex.build()
+
+    def test_search(self):
+        """Test searching names, entities, and code points."""
+
+        self.assertIn(0x41, self.index.search('0041'))
+        self.assertEqual(self.index.search('U+1F600'), [0x1f600])
+        self.assertEqual(self.index.search('&Eacute;'), [0xc9])
+        self.assertEqual(self.index.search('&eacute;'), [0xe9])
+        self.assertIn(0xe9, self.index.search('small e acute'))
+
+    def test_cache(self):
+        """Test that the index is saved and loaded as data, and a damaged cache is ignored."""
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'index', ascii_table.UNICODE_INDEX_FILE)
+            self.index.save(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            loaded = ascii_table.UnicodeIndex.load(path)
+            self.assertEqual(loaded.codes, self.index.codes)
+            self.assertEqual(loaded.search('snowman'), self.index.search('snowman'))
+
+            for name, value in (('postings', data['postings'][:-8]), ('codes', '!'), ('version', [0])):
+                damaged = dict(data)
+                damaged[name] = value
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(damaged, f)
+                self.assertIsNone(ascii_table.UnicodeIndex.load(path), name)
+
+            with open(path, 'wb') as f:
+                pickle.dump(data, f)
+            self.assertIsNone(ascii_table.UnicodeIndex.load(path))
+
+
+class TestPageCommand(unittest.TestCase):
+    """Test paging through the Unicode table and hexdumps."""
+
+    def test_is_enabled(self):
+        """Test that the commands for each kind of paged view only apply to it."""
+
+        unicode_view = fake_sublime.View(settings={'ascii_table.paged': True, 'ascii_table.unicode': True})
+        hexdump_view = fake_sublime.View(settings={'ascii_table.paged': True, 'ascii_table.hexdump': __file__})
+        plain_view = fake_sublime.View()
+        for page in ('next', 'previous', 'goto'):
+            for view, table in ((unicode_view, 'unicode'), (hexdump_view, 'hexdump')):
+                command = ascii_table.AsciiTablePageCommand(view)
+                self.assertTrue(command.is_enabled(page))
+                self.assertTrue(command.is_enabled(page, table))
+                self.assertFalse(command.is_enabled(page, 'hexdump' if table == 'unicode' else 'unicode'))
+            self.assertFalse(ascii_table.AsciiTablePageCommand(plain_view).is_enabled(page))
+
+    def test_goto(self):
+        """Test that each view asks for its own kind of position."""
+
+        window = fake_sublime.active_window()
+        prompts = []
+        window.show_input_panel = lambda caption, *args: prompts.append(caption)
+        unicode_view = fake_sublime.View(window=window, settings={'ascii_table.paged': True})
+        hexdump_view = fake_sublime.View(
+            window=window, settings={'ascii_table.paged': True, 'ascii_table.hexdump': __file__}
+        )
+        ascii_table.AsciiTablePageCommand(unicode_view).run(None, 'goto', 'unicode')
+        ascii_table.AsciiTablePageCommand(unicode_view).run(None, 'goto', 'hexdump')
+        ascii_table.AsciiTablePageCommand(hexdump_view).run(None, 'goto', 'hexdump')
+        self.assertEqual(len(prompts), 2)
+        self.assertTrue(prompts[0].startswith('Code point'))
+        self.assertTrue(prompts[1].startswith('Offset'))
+        del window.show_input_panel
+
+
+class TestCodePages(unittest.TestCase):
+    """Test the code page tables."""
+
+    def row(self, table, code):
+        """Get the columns of a table row."""
+
+        return table.lines[table.row(code)].split()
+
+    def test_moved_characters(self):
+        """Test that characters the code page moves show the decoded character (EBCDIC puts `A` at 0xc1)."""
+
+        table = ascii_table.code_page_table('cp037')
+        self.assertEqual(self.row(table, 0xc1)[:4], ['193', '0xc1', '0o301', 'A'])
+        self.assertEqual(self.row(table, 0x81)[:4], ['129', '0x81', '0o201', 'a'])
+        self.assertIn('Lowercase a', table.lines[table.row(0x81)])
+        self.assertEqual(self.row(table, 0xf0)[:4], ['240', '0xf0', '0o360', '0'])
+        for code in table.codes:
+            char = bytes([code]).decode('cp037')
+            if char.isprintable() and not char.isspace() and ascii_table.unicode_entry(ord(char))[0] is None:
+                self.assertEqual(self.row(table, code)[3], char, hex(code))
+
+    def test_latin_1(self):
+        """Test that a code page that keeps ASCII in place matches the ASCII columns."""
+
+        table = ascii_table.code_page_table('latin-1')
+        self.assertEqual(len(table.codes), 256)
+        self.assertEqual(self.row(table, 0x41)[:4], ['65', '0x41', '0o101', 'A'])
+        self.assertEqual(self.row(table, 0xe9)[:5], ['233', '0xe9', '0o351', 'é', '&eacute;'])
+
+    def test_not_code_pages(self):
+        """Test that codecs that aren't single byte code pages are rejected."""
+
+        for encoding in ('hex', 'base64', 'rot13', 'zlib', 'punycode', 'utf-8', 'utf-16', 'idna'):
+            name = ascii_table.code_page_name(encoding)
+            self.assertFalse(name is not None and ascii_table.is_code_page(name), encoding)
+        for encoding in ('cp037', 'cp437', 'koi8-r', 'latin-1'):
+            self.assertTrue(ascii_table.is_code_page(ascii_table.code_page_name(encoding)), encoding)
+
+
+class TestEscapes(unittest.TestCase):
+    """Test decoding and annotating escapes."""
+
+    def test_decode(self):
+        """Test that each kind of escape is decoded."""
+
+        self.assertEqual(
+            ascii_table.convert_escapes(r'\x41\x80 &#233; &#xe9; &eacute; &Eacute; U+1F600 u+00e9'),
+            ('A€ é é é É 😀 é', 8)
+        )
+
+    def test_annotate(self):
+        """Test that escapes are kept and followed by the character and its description."""
+
+        self.assertEqual(
+            ascii_table.convert_escapes(r'\x80 &#x100; U+0000', annotate=True),
+            (r'\x80 (€ Euro sign) &#x100; (Ā Latin capital letter A with macron) U+0000 (NUL Null)', 3)
+        )
+
+    def test_invalid(self):
+        """Test that escapes that don't stand for a character are left alone."""
+
+        text = r'&#0; &#xD800; U+DFFF &#1114112; &bogus; \x81 \x8d \x8f \x90 \x9d'
+        self.assertEqual(ascii_table.convert_escapes(text), (text, 0))
+        self.assertEqual(ascii_table.convert_escapes(text, annotate=True), (text, 0))
+        self.assertEqual(ascii_table.convert_escapes('U+0000'), ('U+0000', 0))
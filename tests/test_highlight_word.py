@@ -0,0 +1,264 @@
+"""Test HighlightWord."""
+import random
+import unittest
+
+from benchmarks import fake_sublime
+
+fake_sublime.install()
+
+import highlight_word  # noqa: E402
+
+SEPARATORS = " \n./\\()\"'-:,.;<>~!@#$%^&*|+=[]{}`~?"
+VOCABULARY = ('foo', 'bar', 'baz', 'foobar', 'qux', 'a', 'ab', 'abc')
+
+
+class Executor(object):
+    """Hold submitted jobs until they are run."""
+
+    def __init__(self):
+        """Setup."""
+
+        self.jobs = []
+
+    def submit(self, func, *args):
+        """Queue a job."""
+
+        self.jobs.append((func, args))
+
+    def run(self, during=None):
+        """Run the queued jobs on the main thread, calling `during` right after each, and wait for the callbacks."""
+
+        jobs, self.jobs = self.jobs, []
+        for func, args in jobs:
+            def job(func=func, args=args):
+                try:
+                    func(*args)
+                except Exception:
+                    pass
+                if during is not None:
+                    during()
+            fake_sublime.run_main(job)
+        fake_sublime.main_loop.idle()
+
+
+def make_text(rand, words):
+    """Create random lines of words."""
+
+    lines = []
+    for _ in range(words // 8):
+        lines.append(' '.join(rand.choice(VOCABULARY) for _ in range(8)) + '\n')
+    return ''.join(lines)
+
+
+class TestWordIndex(unittest.TestCase):
+    """Test the word index."""
+
+    def setUp(self):
+        """Use small chunks so edits cross chunk boundaries."""
+
+        self.chunk_size = highlight_word.INDEX_CHUNK_SIZE
+        highlight_word.INDEX_CHUNK_SIZE = 64
+
+    def tearDown(self):
+        """Restore the chunk size."""
+
+        highlight_word.INDEX_CHUNK_SIZE = self.chunk_size
+
+    def assert_same(self, index, view):
+        """Check that the index finds the same words as a fresh build."""
+
+        fresh = highlight_word.WordIndex(SEPARATORS)
+        fresh.build(view.text, view.change_count())
+        self.assertEqual(index.change_count, view.change_count())
+        for word in VOCABULARY:
+            self.assertEqual(index.find(word, 0, len(view.text)), fresh.find(word, 0, len(view.text)), word)
+            self.assertEqual(index.find(word, 100, 300), fresh.find(word, 100, 300), word)
+
+    def test_update(self):
+        """Test that random edits give the same index as a rebuild."""
+
+        rand = random.Random(0)
+        view = fake_sublime.View(make_text(rand, 400))
+        index = highlight_word.WordIndex(SEPARATORS)
+        index.build(view.text, view.change_count())
+
+        for _ in range(200):
+            changes = []
+            for _ in range(rand.randint(1, 3)):
+                begin = rand.randint(0, len(view.text))
+                end = min(len(view.text), begin + rand.choice((0, 1, 5, 40, 200)))
+                inserted = rand.choice(('', ' ', '\n', 'foo', 'bar baz\nqux ', make_text(rand, 16)))
+                view.replace(None, fake_sublime.Region(begin, end), inserted)
+                changes.append((begin, end, len(inserted)))
+            index.update(view, changes)
+            self.assert_same(index, view)
+
+    def test_update_empty(self):
+        """Test filling an empty buffer."""
+
+        view = fake_sublime.View('')
+        index = highlight_word.WordIndex(SEPARATORS)
+        index.build(view.text, view.change_count())
+        view.insert(None, 0, 'foo bar\nfoo\n')
+        index.update(view, [(0, 0, 12)])
+        self.assert_same(index, view)
+        self.assertEqual(index.find('foo', 0, 12), [0, 8])
+
+
+class TestGetWordIndex(unittest.TestCase):
+    """Test building the word index in the background."""
+
+    def setUp(self):
+        """Hold the builds in a test executor."""
+
+        self.executor = highlight_word.executor
+        highlight_word.executor = Executor()
+        highlight_word.word_indexes.clear()
+        self.view = fake_sublime.View('foo bar\nbaz foo\n')
+
+    def tearDown(self):
+        """Restore the executor."""
+
+        highlight_word.executor = self.executor
+        highlight_word.word_indexes.clear()
+
+    def test_build(self):
+        """Test that the index is built on the first lookup and used once it is ready."""
+
+        self.assertIsNone(highlight_word.get_word_index(self.view, SEPARATORS))
+        self.assertEqual(len(highlight_word.executor.jobs), 1)
+        self.assertIsNone(highlight_word.get_word_index(self.view, SEPARATORS))
+        self.assertEqual(len(highlight_word.executor.jobs), 1)
+
+        highlight_word.executor.run()
+        index = highlight_word.get_word_index(self.view, SEPARATORS)
+        self.assertIsNotNone(index)
+        self.assertEqual(index.find('foo', 0, self.view.size()), [0, 12])
+
+    def test_edit_during_build(self):
+        """Test that the index is rebuilt if the buffer changes while it is being built."""
+
+        self.assertIsNone(highlight_word.get_word_index(self.view, SEPARATORS))
+        highlight_word.executor.run(lambda: self.view.insert(None, 0, 'foo '))
+        self.assertIsNone(highlight_word.get_word_index(self.view, SEPARATORS))
+        self.assertEqual(len(highlight_word.executor.jobs), 1)
+
+        highlight_word.executor.run()
+        index = highlight_word.get_word_index(self.view, SEPARATORS)
+        self.assertIsNotNone(index)
+        self.assertEqual(index.find('foo', 0, self.view.size()), [0, 4, 16])
+
+    def test_failed_build(self):
+        """Test that a failed build doesn't stop later builds."""
+
+        def substr(region):
+            raise RuntimeError('substr')
+
+        self.view.substr = substr
+        self.assertIsNone(highlight_word.get_word_index(self.view, SEPARATORS))
+        highlight_word.executor.run()
+        self.assertNotIn(self.view.buffer_id(), highlight_word.word_indexes)
+
+        del self.view.substr
+        self.assertIsNone(highlight_word.get_word_index(self.view, SEPARATORS))
+        highlight_word.executor.run()
+        self.assertIsNotNone(highlight_word.get_word_index(self.view, SEPARATORS))
+
+    def test_separators(self):
+        """Test that the index is rebuilt for other separators."""
+
+        self.assertIsNone(highlight_word.get_word_index(self.view, SEPARATORS))
+        highlight_word.executor.run()
+        self.assertIsNone(highlight_word.get_word_index(self.view, SEPARATORS + 'o'))
+        highlight_word.executor.run()
+        index = highlight_word.get_word_index(self.view, SEPARATORS + 'o')
+        self.assertIsNotNone(index)
+        self.assertEqual(index.find('f', 0, self.view.size()), [0, 12])
+
+
+def brute_pinned(text, words, separators, begin, end):
+    """Find the pinned words one position at a time, the leftmost and then the longest match winning."""
+
+    results = [[] for w in words]
+    pos = begin
+    while pos < end:
+        best = None
+        if pos == 0 or text[pos - 1] in separators:
+            for i, word in enumerate(words):
+                stop = pos + len(word)
+                if (
+                    stop <= end and text.startswith(word, pos) and (stop == len(text) or text[stop] in separators) and
+                    (best is None or len(word) > len(words[best]))
+                ):
+                    best = i
+        if best is None:
+            pos += 1
+        else:
+            results[best].append((pos, pos + len(words[best])))
+            pos += len(words[best])
+    return results
+
+
+class TestFindPinned(unittest.TestCase):
+    """Test finding the pinned words."""
+
+    def test_matches(self):
+        """Test that the automaton finds every occurrence, overlapping or not."""
+
+        words = ('he', 'she', 'his', 'hers', 'h', 'e')
+        automaton = highlight_word.Automaton(words)
+        text = 'ushers hishe shehe'
+        expected = sorted(
+            (pos + len(word), i) for i, word in enumerate(words)
+            for pos in range(len(text)) if text.startswith(word, pos)
+        )
+        self.assertEqual(sorted(automaton.matches(text, 0, len(text))), expected)
+        self.assertEqual(
+            sorted(automaton.matches(text, 7, 12)),
+            sorted((stop, i) for stop, i in expected if stop - len(words[i]) >= 7 and stop <= 12)
+        )
+
+    def test_find_pinned(self):
+        """Test that random text gives the same matches as a brute force search."""
+
+        rand = random.Random(1)
+        words = ('foo', 'bar', 'foo bar', 'bar baz', 'a', 'ab', 'abc', 'b')
+        automaton = highlight_word.compile_pins(words)
+        for _ in range(200):
+            text = ''.join(rand.choice(('foo', 'bar', 'baz', 'a', 'b', 'c', ' ', '.', '\n')) for _ in range(60))
+            begin = rand.randint(0, len(text))
+            end = rand.randint(begin, len(text))
+            found = highlight_word.find_pinned(text, 0, automaton, SEPARATORS, begin, end)
+            self.assertEqual(
+                [[(r.begin(), r.end()) for r in regions] for regions in found],
+                brute_pinned(text, words, SEPARATORS, begin, end),
+                text
+            )
+
+    def test_offset(self):
+        """Test that the regions are relative to the start of the buffer."""
+
+        automaton = highlight_word.compile_pins(('foo', 'bar'))
+        found = highlight_word.find_pinned('foo bar', 10, automaton, SEPARATORS, 10, 17)
+        self.assertEqual([[(r.begin(), r.end()) for r in regions] for regions in found], [[(10, 13)], [(14, 17)]])
+
+
+class TestDrawRegions(unittest.TestCase):
+    """Test skipping redraws."""
+
+    def test_draw_regions(self):
+        """Test that the same regions are only drawn again after an edit."""
+
+        view = fake_sublime.View('foo bar foo\n')
+        regions = [fake_sublime.Region(0, 3), fake_sublime.Region(8, 11)]
+        highlight_word.draw_regions(view, 'test', regions, 'string', 0)
+        highlight_word.draw_regions(view, 'test', list(regions), 'string', 0)
+        self.assertEqual(view.calls.get('add_regions'), 1)
+
+        view.insert(None, 4, '\n')
+        view.replace(None, fake_sublime.Region(4, 5), '')
+        highlight_word.draw_regions(view, 'test', list(regions), 'string', 0)
+        self.assertEqual(view.calls.get('add_regions'), 2)
+
+        highlight_word.erase_regions(view, 'test')
+        highlight_word.drawn.pop(view.id(), None)